@@ -7,16 +7,23 @@ import sys
 from argparse import Action, ArgumentParser
 from os import getpid
 from os.path import join
+from typing import Optional, Tuple, List
 
 import pygame as pg
 
-import barbariantuw.core
 import barbariantuw.scenes as scenes
 from barbariantuw import (
     __version__, PROG, OPTS, Game, Partie, IMG_PATH, FRAME_RATE,
 )
 from barbariantuw.sprites import loc2pxX
-from barbariantuw.core import Txt
+from barbariantuw.assets import (
+    MIXER, disk_cache, pcm_cache, open_img, fetch_bundles, stage_bundles,
+    prerender_cache
+)
+from barbariantuw.core import (
+    Txt, Preloader, img_cache, anim_tables, release_assets
+)
+from barbariantuw.display import RENDERERS, Display, RendererDisplay
 
 psutil = None
 if sys.platform != 'emscripten':
@@ -28,22 +35,33 @@ if sys.platform != 'emscripten':
 
 class BarbarianMain(object):
     _scene: scenes.EmptyScene = None
+    prefetch: Optional[Preloader] = None  # next stage assets
+    fetching: List[asyncio.Future] = []  # next stage bundles, web
+    following: Optional[Tuple[str, int]] = None  # stage of `fetching`
+    awaiting: List[asyncio.Future] = []  # bundles of the starting battle
+    window_size = Game.screen  # windowed mode
 
     def __init__(self, opts):
         pg.joystick.init()
         self.joysticks = [pg.joystick.Joystick(x)
                           for x in range(pg.joystick.get_count())]
+        if opts.sound:
+            pg.mixer.pre_init(*MIXER)  # of the pak PCM
         pg.init()
         pgdi = pg.display.Info()
         self.desktopSize = (pgdi.current_w, pgdi.current_h)
-        self.screen = pg.display.set_mode(Game.screen)
-        if opts.sound:
-            pg.mixer.pre_init(44100, -16, 1, 4096)
-        pg.display.set_caption('BARBARIAN AMIGA (PyGame)', 'BARBARIAN')
-        pg.display.set_icon(pg.image.load(join(IMG_PATH, 'menu/icone.gif'))
-                            .convert_alpha())
+        if opts.native:  # scenes draw into the back buffer
+            n = opts.native
+            self.reinit((320 * n, 200 * n), n, n)
+        self.display = self.open_display(opts)
+        self.display.set_caption(
+            'BARBARIAN AMIGA (PyGame)',
+            open_img(join(IMG_PATH, 'menu/icone.gif')).convert_alpha())
         self.opts = opts
         self.running = True
+        img_cache.budget = opts.img_cache * 1024 * 1024
+        disk_cache.enabled = disk_cache.enabled and opts.disk_cache
+        pcm_cache.enabled = pcm_cache.enabled and opts.disk_cache
         #
         self.debugGrp = []
         if self.opts.debug:
@@ -55,6 +73,7 @@ class BarbarianMain(object):
             #   virtual memory used by the process.
             self.mem_vms = Txt.Debug(0, self.mem_rss.rect.bottom)
             self.fps = Txt.Debug(0, self.mem_vms.rect.bottom)
+            self.imgCache = Txt.Debug(0, self.fps.rect.bottom)
             self.lblSlowmo = Txt.Debug(loc2pxX(18), 10)
         self.show_logo()
         if Game.fullscreen:
@@ -76,7 +95,7 @@ class BarbarianMain(object):
         if self.opts.debug:
             # noinspection PyTypeChecker
             self.scene.add(self.cpu, self.mem_rss, self.mem_vms, self.fps,
-                           self.lblSlowmo,
+                           self.imgCache, self.lblSlowmo,
                            layer=99)
         gc.collect()
 
@@ -100,6 +119,7 @@ class BarbarianMain(object):
 
     def show_menu(self):
         self.scene = self.menu()
+        fetch_bundles(stage_bundles(4))  # demo
 
     def start_battle_demo(self):
         Game.scoreA = 0
@@ -127,45 +147,77 @@ class BarbarianMain(object):
                                         on_back=self.show_menu)
 
     def start_battle(self):
-        self.scene = scenes.Battle(self.opts,
-                                   on_esc=self.show_menu,
-                                   on_finish=self.finish_battle,
-                                   on_next=self.next_stage)
+        self.awaiting = fetch_bundles(stage_bundles(Game.ia))
+        if self.awaiting:
+            return  # not fetched yet, `main` awaits them and starts again
+        release_assets('menu')
+        img_cache.unpin()
+        with img_cache.pinning():
+            self.scene = scenes.Battle(self.opts,
+                                       on_esc=self.quit_battle,
+                                       on_finish=self.finish_battle,
+                                       on_next=self.next_stage)
+        if stage := self.following_stage():
+            self.prefetch_stage(stage)
+
+    def prefetch_stage(self, stage: Tuple[str, int]):
+        """
+        Loads the stage assets in the background, after its bundles.
+        """
+        self.fetching = fetch_bundles(stage_bundles(stage[1]))
+        if self.fetching:
+            self.following = stage
+        else:
+            self.prefetch = Preloader(scenes.stage_jobs(*stage))
+
+    def release_battle(self, decor: str = None, ia: int = None):
+        """
+        Frees the left stage assets, except the `decor` and `ia` ones.
+        """
+        if self.prefetch:
+            self.prefetch.cancel()
+            self.prefetch = None
+        self.fetching = []
+        img_cache.unpin()
+        release_assets('stage', decor)
+        release_assets('opponent',
+                       None if ia is None else f'spritesB/spritesB{ia}')
+
+    def quit_battle(self):
+        self.release_battle()
+        self.show_menu()
 
     def finish_battle(self):
+        self.release_battle()
         if Game.partie == Partie.solo:
             self.show_hiscores()
         else:
             self.show_menu()
 
-    def next_stage(self):
+    @staticmethod
+    def following_stage() -> Optional[Tuple[str, int]]:
+        """
+        (decor, ia) of the next stage, None for the last one and the demo.
+        """
+        decor, ia = Game.decor, Game.ia
         if Game.partie == Partie.solo:
-            Game.ia += 1
-            if Game.ia == 1:
-                Game.decor = 'plaine'
-            if Game.ia == 2:
-                Game.decor = 'foret'
-            if Game.ia == 3:
-                Game.decor = 'plaine'
-            if Game.ia == 4:
-                Game.decor = 'trone'
-            if Game.ia == 5:
-                Game.decor = 'arene'
-            if Game.ia == 6:
-                Game.decor = 'trone'
-            if Game.ia == 7:
-                Game.decor = 'arene'
-
-        if Game.partie == Partie.vs:
-            if Game.decor == 'plaine':
-                Game.decor = 'foret'
-            elif Game.decor == 'foret':
-                Game.decor = 'plaine'
-            elif Game.decor == 'trone':
-                Game.decor = 'arene'
-            elif Game.decor == 'arene':
-                Game.decor = 'trone'
+            if ia == 7:
+                return None
+            ia += 1
+            decor = ('foret', 'plaine', 'foret', 'plaine',
+                     'trone', 'arene', 'trone', 'arene')[ia]
+
+        elif Game.partie == Partie.vs:
+            decor = {'plaine': 'foret', 'foret': 'plaine',
+                     'trone': 'arene', 'arene': 'trone'}[decor]
+        else:
+            return None
+        return decor, ia
 
+    def next_stage(self):
+        if stage := self.following_stage():
+            Game.decor, Game.ia = stage
+        self.release_battle(Game.decor, Game.ia)
         self.start_battle()
 
     def show_opts_ver(self):
@@ -203,7 +255,9 @@ class BarbarianMain(object):
     # noinspection PyTypeChecker
     @staticmethod
     def reinit(size=Game.screen, scx=Game.scx, scy=Game.scy):
-        barbariantuw.core.img_cache.clear()
+        Preloader.cancel_all()  # no old scale images after the clear
+        img_cache.clear()
+        anim_tables.clear()
         Txt.cache.clear()
         gc.collect()
         #
@@ -213,30 +267,50 @@ class BarbarianMain(object):
         Game.chw = int(320 / 40 * scx)
         Game.chh = int(200 / 25 * scy)
 
+    def open_display(self, opts) -> Display:
+        buffer = Game.screen if opts.native else None
+        if opts.renderer != 'surface' and not opts.web:
+            try:
+                return RendererDisplay(self.window_size,
+                                       buffer or self.window_size,
+                                       opts.renderer == 'gpu')
+            except (RuntimeError, ImportError) as ex:
+                print(f'{opts.renderer} renderer error: {ex}')
+        return Display(self.window_size, buffer)
+
+    @property
+    def screen(self) -> pg.Surface:
+        return self.display.screen
+
     def toggle_fullscreen(self, fullscreen):
         # TODO: Toggle fullscreen with multi-display
-        if fullscreen and not self.opts.web and not pg.display.is_fullscreen():
-            scx = self.desktopSize[0] / 320
-            scy = self.desktopSize[1] / 200
-            self.reinit(self.desktopSize, scx, scy)
-            pg.display.set_mode(self.desktopSize)
-            pg.display.toggle_fullscreen()
-        if not fullscreen and not self.opts.web and pg.display.is_fullscreen():
-            self.reinit()
-            pg.display.toggle_fullscreen()
-            pg.display.set_mode(Game.screen)
+        if self.opts.web or fullscreen == self.display.fullscreen:
+            return
+        native = self.opts.native
+        if fullscreen:
+            if not native:
+                scx = self.desktopSize[0] / 320
+                scy = self.desktopSize[1] / 200
+                self.reinit(self.desktopSize, scx, scy)
+            self.display.set_mode(self.desktopSize, True, Game.screen)
+        else:
+            if not native:
+                self.reinit()
+            self.display.set_mode(self.window_size, False, Game.screen)
 
     def on_fullscreen(self):
         Game.fullscreen = True
         self.toggle_fullscreen(Game.fullscreen)
         Game.save_options()
-        self.show_logo()
+        if not self.opts.native:  # the scaled images are flushed
+            self.show_logo()
 
     def on_window(self):
         Game.fullscreen = False
         self.toggle_fullscreen(Game.fullscreen)
         Game.save_options()
-        self.show_logo()
+        if not self.opts.native:
+            self.show_logo()
 
     async def main(self):
         cpu_timer = 0
@@ -278,6 +352,10 @@ class BarbarianMain(object):
             current_time = pg.time.get_ticks()
             if not self.opts.web and self.opts.debug:
                 self.fps.msg = f'FPS: {clock.get_fps():.0f}'
+                cached = f'{img_cache.size / 1024:>7,.0f}'.replace(',', ' ')
+                self.imgCache.msg = (f'Img: {cached} Kb,'
+                                     f' hit {img_cache.hit_rate:.0%},'
+                                     f' dup {img_cache.dups}')
                 if psutil:
                     if current_time - cpu_timer > self.opts.cpu_time:
                         cpu_timer = current_time
@@ -291,10 +369,18 @@ class BarbarianMain(object):
                         self.mem_rss.msg = resident.replace(',', ' ')
                         virtual = f'Mem VMS: {mem.vms / 1024:>7,.0f} Kb'
                         self.mem_vms.msg = virtual.replace(',', ' ')
+            if self.awaiting:
+                await asyncio.gather(*self.awaiting)
+                self.start_battle()
+            if self.fetching and all(f.done() for f in self.fetching):
+                self.prefetch_stage(self.following)
+            if (self.prefetch
+                    and (sys.platform != 'emscripten' or self._scene.idle)
+                    and self.prefetch.poll()):
+                self.prefetch = None  # inline on WASM, after the fight
             self._scene.update(current_time)
 
-            dirty = self._scene.draw(self.screen)
-            pg.display.update(dirty)
+            self.display.render(self._scene)
             if self.opts.web:
                 await asyncio.sleep(0)
             elif slowmo:
@@ -332,6 +418,34 @@ def arg_parser():
         dest='fullscreen', nargs=0, action=BooleanAction,
         help='no/fullscreen (default options.dat or window)')
 
+    parser.add_argument(
+        '--img-cache',
+        action='store', dest='img_cache', type=int, default=64,
+        help='image cache budget (Mb), 0 - unlimited. Default: 64 Mb')
+
+    parser.add_argument(
+        '--native', type=int, nargs='?', const=1, default=0, metavar='N',
+        help='draw at N x 320x200 (default 1) into a back buffer, upscaled'
+             ' once to the window, the images are not rescaled')
+
+    parser.add_argument(
+        '--renderer', choices=RENDERERS, default='surface',
+        help='surface: blit to the window surface (default), gpu: SDL2'
+             ' renderer compositing the battle from textures, software:'
+             ' SDL2 software renderer scaling the frame as a texture, gpu'
+             ' falls back to software')
+
+    parser.add_argument(
+        '--no-disk-cache', '--disk-cache',
+        dest='disk_cache', default=True, nargs=0, action=BooleanAction,
+        help='keep scaled images and decoded sounds on disk between launches'
+             ' (default on)')
+
+    parser.add_argument(
+        '--prerender', action='store_true',
+        help='render the images at the window and fullscreen scales into'
+             ' the disk cache, then exit')
+
     debug = parser.add_argument_group('Debug Options', description='')
 
     debug.add_argument(
@@ -351,7 +465,10 @@ def arg_parser():
 
 
 def run():
-    args = arg_parser().parse_args()
+    parser = arg_parser()
+    args = parser.parse_args()
+    if args.prerender and not args.disk_cache:
+        parser.error('--prerender needs the disk cache')
     args.web = (sys.platform == 'emscripten')
     for k, v in args.__dict__.items():
         OPTS.__setattr__(k, v)
@@ -360,6 +477,17 @@ def run():
         Game.country = 'USA' if args.usa else 'EUROPE'
     if args.fullscreen is not None:
         Game.fullscreen = args.fullscreen
+    if args.prerender:
+        if args.native:  # see toggle_fullscreen
+            scales = [(args.native, args.native)]
+        else:
+            pg.display.init()
+            pgdi = pg.display.Info()
+            scales = [(Game.scx, Game.scy),
+                      (pgdi.current_w / 320, pgdi.current_h / 200)]
+            pg.display.quit()
+        prerender_cache(dict.fromkeys(scales))
+        return
     asyncio.run(BarbarianMain(args).main())
 
 
@@ -1,7 +1,8 @@
 from barbariantuw import Game
-from barbariantuw.core import Act, Animation, Actions, frame
+from barbariantuw.core import Act, Animation, Actions, frame, mirror, anim_table
 
 
+@anim_table
 def serpent():
     return {
         'idle': Animation(frames=[
@@ -23,6 +24,7 @@ def serpent():
     }
 
 
+@anim_table
 def serpent_rtl():
     return {
         'idle': Animation(frames=[
@@ -44,6 +46,7 @@ def serpent_rtl():
     }
 
 
+@anim_table
 def sang_decap():
     return {
         'sang_touche': Animation(frames=[
@@ -86,6 +89,7 @@ def sang_decap():
     }
 
 
+@anim_table
 def tete_decap(subdir: str):
     return {
         'teteagauche': Animation(frames=[
@@ -208,6 +212,7 @@ def tete_decap(subdir: str):
     }
 
 
+@anim_table
 def teteombre_decap():
     return {
         'teteagauche': Animation(frames=[
@@ -277,6 +282,7 @@ def teteombre_decap():
     }
 
 
+@anim_table
 def vie():
     return {
         'vie': Animation(frames=[
@@ -308,6 +314,7 @@ def vie():
     }
 
 
+@anim_table
 def barb(subdir: str):
     return {
         'debout': Animation(frames=[
@@ -588,296 +595,59 @@ def barb(subdir: str):
     }
 
 
+@anim_table
 def barb_rtl(subdir: str):
-    return {
-        'debout': Animation(frames=[
-            frame(f'{subdir}/debout.gif', xflip=True, dy=18 * Game.scy),
-        ]),
-        'attente': Animation(frames=[
-            frame(f'{subdir}/attente1.gif', xflip=True, tick=15,                   dy=18 * Game.scy),
-            frame(f'{subdir}/attente2.gif', xflip=True, tick=23, dx=-4 * Game.scx, dy=19 * Game.scy),
-            frame(f'{subdir}/attente3.gif', xflip=True, tick=30, dx=-4 * Game.scx, dy=19 * Game.scy),
-            frame(f'{subdir}/attente2.gif', xflip=True, tick=37, dx=-4 * Game.scx, dy=19 * Game.scy),
-            frame(f'{subdir}/attente1.gif', xflip=True, tick=50,                   dy=18 * Game.scy),
-        ], actions=[
-            Act(tick=8, act=Actions.snd, snd='attente.ogg')
-        ]),
-        'avance': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/marche1.gif', xflip=True, tick=9,  mv=(-Game.chw, 0), dx=6 * Game.scx, dy=18 * Game.scy),
-            frame(f'{subdir}/marche2.gif', xflip=True, tick=17, mv=(-Game.chw, 0), dx=6 * Game.scx, dy=18 * Game.scy),
-            frame(f'{subdir}/marche3.gif', xflip=True, tick=27, mv=(-Game.chw, 0),                  dy=18 * Game.scy),
-            frame(f'{subdir}/debout.gif',  xflip=True, tick=36, mv=(-Game.chw, 0), dy=18 * Game.scy),
-            frame(f'{subdir}/debout.gif',  xflip=True, tick=37,                    dy=18 * Game.scy),
-            # @formatter:on
-        ]),
-        'recule': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/marche3.gif', xflip=True, tick=9,  mv=(Game.chw, 0),                  dy=18 * Game.scy),
-            frame(f'{subdir}/marche2.gif', xflip=True, tick=18, mv=(Game.chw, 0), dx=6 * Game.scx, dy=18 * Game.scy),
-            frame(f'{subdir}/marche1.gif', xflip=True, tick=26, mv=(Game.chw, 0), dx=6 * Game.scx, dy=18 * Game.scy),
-            frame(f'{subdir}/debout.gif',  xflip=True, tick=36, mv=(Game.chw, 0), dy=18 * Game.scy),
-            frame(f'{subdir}/debout.gif',  xflip=True, tick=37,                   dy=18 * Game.scy),
-            # @formatter:on
-        ]),
-        'saute': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/saut1.gif',  xflip=True, tick=13, dx=-4 * Game.scx, dy=6 * Game.scy),
-            frame(f'{subdir}/saut2.gif',  xflip=True, tick=30, dx=-8 * Game.scx, dy=5 * Game.scy),
-            frame(f'{subdir}/saut1.gif',  xflip=True, tick=40, dx=-5 * Game.scx, dy=6 * Game.scy),
-            frame(f'{subdir}/debout.gif', xflip=True, tick=47,                   dy=18 * Game.scy),
-            # @formatter:on
-        ], actions=[
-            Act(tick=47, act=Actions.stop)
-        ]),
-        'assis': Animation(frames=[
-            frame(f'{subdir}/assis1.gif', xflip=True, dy=26 * Game.scy),
-            frame(f'{subdir}/assis2.gif', xflip=True, dy=38 * Game.scy),
-        ]),
-        'releve': Animation(frames=[
-            frame(f'{subdir}/assis1.gif', xflip=True, dy=26 * Game.scy),
-        ]),
-        'rouladeAV': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/roulade1.gif', xflip=True, tick=4,  mv=(-Game.chw, 0), dx=3 * Game.scx,  dy=38 * Game.scy),
-            frame(f'{subdir}/roulade1.gif', xflip=True, tick=7,  mv=(-Game.chw, 0), dx=3 * Game.scx,  dy=38 * Game.scy),
-            frame(f'{subdir}/roulade1.gif', xflip=True, tick=10, mv=(-Game.chw, 0), dx=3 * Game.scx,  dy=38 * Game.scy),
-            frame(f'{subdir}/roulade2.gif', xflip=True, tick=13, mv=(-Game.chw, 0),                   dy=63 * Game.scy),
-            frame(f'{subdir}/roulade3.gif',             tick=16, mv=(-Game.chw, 0), dx=10 * Game.scx, dy=56 * Game.scy),
-            frame(f'{subdir}/roulade3.gif',             tick=19, mv=(-Game.chw, 0), dx=10 * Game.scx, dy=56 * Game.scy),
-            frame(f'{subdir}/roulade2.gif',             tick=22, mv=(-Game.chw, 0), dx=8 * Game.scx,  dy=63 * Game.scy),
-            frame(f'{subdir}/roulade2.gif',             tick=25, mv=(-Game.chw, 0), dx=8 * Game.scx,  dy=63 * Game.scy),
-            frame(f'{subdir}/roulade5.gif',             tick=28, mv=(-Game.chw, 0), dx=10 * Game.scx, dy=56 * Game.scy),
-            frame(f'{subdir}/roulade5.gif',             tick=30, mv=(-Game.chw, 0), dx=10 * Game.scx, dy=56 * Game.scy),
-            frame(f'{subdir}/roulade1.gif',             tick=34, mv=(-Game.chw, 0), dx=4 * Game.scx,  dy=38 * Game.scy),
-            frame(f'{subdir}/debout.gif',   xflip=True, tick=40, dy=18 * Game.scy),
-            # @formatter:on
-        ], actions=[
-            Act(tick=2, act=Actions.snd, snd='roule.ogg')
-        ]),
-        'rouladeAV-out': Animation(frames=[
-            # non-movable roulade out
-            # @formatter:off
-            frame(f'{subdir}/roulade3.gif',             tick=16, dx=10 * Game.scx, dy=56 * Game.scy),
-            frame(f'{subdir}/roulade3.gif',             tick=19, dx=10 * Game.scx, dy=56 * Game.scy),
-            frame(f'{subdir}/roulade2.gif',             tick=22, dx=8 * Game.scx,  dy=63 * Game.scy),
-            frame(f'{subdir}/roulade2.gif',             tick=25, dx=8 * Game.scx,  dy=63 * Game.scy),
-            frame(f'{subdir}/roulade5.gif',             tick=28, dx=10 * Game.scx, dy=56 * Game.scy),
-            frame(f'{subdir}/roulade5.gif',             tick=30, dx=10 * Game.scx, dy=56 * Game.scy),
-            frame(f'{subdir}/roulade1.gif',             tick=34, dx=4 * Game.scx,  dy=38 * Game.scy),
-            frame(f'{subdir}/debout.gif',   xflip=True, tick=40, dy=18 * Game.scy),
-            # @formatter:on
-        ]),
-        'rouladeAR': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/roulade1.gif',             tick=5,  mv=(Game.chw, 0), dx=4 * Game.scx,  dy=38 * Game.scy),
-            frame(f'{subdir}/roulade5.gif',             tick=8,  mv=(Game.chw, 0), dx=10 * Game.scx, dy=56 * Game.scy),
-            frame(f'{subdir}/roulade2.gif',             tick=11, mv=(Game.chw, 0), dx=8 * Game.scx,  dy=63 * Game.scy),
-            frame(f'{subdir}/roulade2.gif',             tick=14, mv=(Game.chw, 0), dx=8 * Game.scx,  dy=63 * Game.scy),
-            frame(f'{subdir}/roulade3.gif',             tick=17, mv=(Game.chw, 0), dx=10 * Game.scx, dy=56 * Game.scy),
-            frame(f'{subdir}/roulade3.gif',             tick=20, mv=(Game.chw, 0), dx=10 * Game.scx, dy=56 * Game.scy),
-            frame(f'{subdir}/roulade2.gif', xflip=True, tick=23, mv=(Game.chw, 0),                   dy=63 * Game.scy),
-            frame(f'{subdir}/roulade2.gif', xflip=True, tick=26, mv=(Game.chw, 0),                   dy=63 * Game.scy),
-            frame(f'{subdir}/roulade1.gif', xflip=True, tick=29, mv=(Game.chw, 0), dx=3 * Game.scx,  dy=38 * Game.scy),
-            frame(f'{subdir}/roulade1.gif', xflip=True, tick=35, mv=(Game.chw, 0), dx=3 * Game.scx,  dy=38 * Game.scy),
-            # @formatter:on
-        ], actions=[
-            Act(tick=2, act=Actions.snd, snd='roule.ogg')
-        ]),
-        'protegeH': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/marche1.gif',  xflip=True, tick=5, mv=(Game.chw, 0), dx=6 * Game.scx,  dy=18 * Game.scy),
-            frame(f'{subdir}/protegeH.gif', xflip=True, tick=9,                                     dy=21 * Game.scy),
-            # @formatter:on
-        ], actions=[
-            Act(tick=2, act=Actions.snd, snd='protege.ogg')
-        ]),
-        'protegeD': Animation(frames=[
-            frame(f'{subdir}/protegeH.gif', xflip=True, tick=5, dy=21 * Game.scy),
-            frame(f'{subdir}/protegeD.gif', xflip=True, tick=9, dy=19 * Game.scy),
-        ]),
-        'cou': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/protegeH.gif', xflip=True, tick=15,                    dy=21 * Game.scy),
-            frame(f'{subdir}/cou2.gif',     xflip=True, tick=30,                    dy=17 * Game.scy),
-            frame(f'{subdir}/cou3.gif',     xflip=True, tick=46, dx=-31 * Game.scx, dy=19 * Game.scy),
-            # @formatter:on
-        ], actions=[
-            Act(tick=15, act=Actions.snd, snd='epee.ogg'),
-        ]),
-        'devant': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/devant1.gif', xflip=True, tick=10,                    dy=17 * Game.scy),
-            frame(f'{subdir}/devant2.gif', xflip=True, tick=20,                    dy=23 * Game.scy),
-            frame(f'{subdir}/devant3.gif', xflip=True, tick=30, dx=-19 * Game.scx, dy=23 * Game.scy),
-            frame(f'{subdir}/devant2.gif', xflip=True, tick=46,                    dy=23 * Game.scy),
-            # @formatter:on
-        ], actions=[
-            Act(tick=10, act=Actions.snd, snd='epee.ogg'),
-        ]),
-        'genou': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/genou1.gif', xflip=True, tick=10, dx=-2 * Game.scx, dy=38 * Game.scy),
-            frame(f'{subdir}/assis2.gif', xflip=True, tick=20, dy=38 * Game.scy),
-            frame(f'{subdir}/genou3.gif', xflip=True, tick=30, dx=-26 * Game.scx, dy=38 * Game.scy),
-            frame(f'{subdir}/assis2.gif', xflip=True, tick=46, dy=38 * Game.scy),
-            # @formatter:on
-        ], actions=[
-            Act(tick=10, act=Actions.snd, snd='epee.ogg'),
-        ]),
-        'araignee': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/toile1.gif', xflip=True, tick=8,  dx=-2 * Game.scx,  dy=18 * Game.scy),
-            frame(f'{subdir}/toile2.gif', xflip=True, tick=15, dx=-8 * Game.scx,  dy=19 * Game.scy),
-            frame(f'{subdir}/toile3.gif', xflip=True, tick=20, dx=-1 * Game.scx,  dy=18 * Game.scy),
-            frame(f'{subdir}/toile4.gif', xflip=True, tick=33, dx=-21 * Game.scx, dy=18 * Game.scy),
-            # @formatter:on
-        ], actions=[
-            Act(tick=8, act=Actions.snd, snd='epee.ogg'),
-            Act(tick=20, act=Actions.snd, snd='epee.ogg'),
-        ]),
-        'coupdepied': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/pied1.gif',  xflip=True, tick=9,  dx=-3 * Game.scx, dy=17 * Game.scy),
-            frame(f'{subdir}/pied2.gif',  xflip=True, tick=30, dx=-8 * Game.scx, dy=17 * Game.scy),
-            frame(f'{subdir}/pied1.gif',  xflip=True, tick=45, dx=-3 * Game.scx, dy=17 * Game.scy),
-            frame(f'{subdir}/debout.gif', xflip=True, tick=51,                   dy=18 * Game.scy),
-            # @formatter:on
-        ]),
-        'coupdetete': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/debout.gif', xflip=True, tick=8,                                      dy=18 * Game.scy),
-            frame(f'{subdir}/tete1.gif',  xflip=True, tick=18, mv=(-Game.chw, 0), dx=2 * Game.scx, dy=19 * Game.scy),
-            frame(f'{subdir}/tete2.gif',  xflip=True, tick=28,                    dx=1 * Game.scx, dy=17 * Game.scy),
-            frame(f'{subdir}/tete1.gif',  xflip=True, tick=38,                    dx=2 * Game.scx, dy=19 * Game.scy),
-            frame(f'{subdir}/debout.gif', xflip=True, tick=40, mv=(Game.chw, 0),                   dy=18 * Game.scy),
-            # @formatter:on
-        ]),
-        'decapite': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/retourne1.gif', xflip=True, tick=4,  mv=(-Game.chw, 0), dx=4 * Game.scx,   dy=14 * Game.scy),  # noqa
-            frame(f'{subdir}/retourne1.gif', xflip=True, tick=5,  mv=(-Game.chw, 0), dx=4 * Game.scx,   dy=14 * Game.scy),  # noqa
-            frame(f'{subdir}/retourne2.gif', xflip=True, tick=9,                                        dy=13 * Game.scy),  # noqa
-            frame(f'{subdir}/retourne2.gif', xflip=True, tick=14, mv=(-Game.chw, 0),                    dy=13 * Game.scy),  # noqa
-            frame(f'{subdir}/retourne3.gif', xflip=True, tick=15,                    dx=2 * Game.scx,   dy=14 * Game.scy),  # noqa
-            frame(f'{subdir}/retourne3.gif', xflip=True, tick=19, mv=(-Game.chw, 0), dx=2 * Game.scx,   dy=14 * Game.scy),  # noqa
-            frame(f'{subdir}/retourne3.gif', xflip=True, tick=24, mv=(-Game.chw, 0), dx=2 * Game.scx,   dy=14 * Game.scy),  # noqa
-            frame(f'{subdir}/retourne3.gif', xflip=True, tick=29,                    dx=2 * Game.scx,   dy=14 * Game.scy),  # noqa
-            frame(f'{subdir}/protegeH.gif',  xflip=True, tick=33,                                       dy=21 * Game.scy),  # noqa
-            frame(f'{subdir}/cou2.gif',      xflip=True, tick=39,                                       dy=17 * Game.scy),  # noqa
-            frame(f'{subdir}/cou3.gif',      xflip=True, tick=51,                    dx=-31 * Game.scx, dy=19 * Game.scy),  # noqa
-            frame(f'{subdir}/cou2.gif',      xflip=True, tick=60,                                       dy=17 * Game.scy),  # noqa
-            # @formatter:on
-        ], actions=[
-            Act(tick=15, act=Actions.snd, snd='decapite.ogg'),
-        ]),
-        'front': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/front1.gif', xflip=True, tick=5,                     dy=17 * Game.scy),
-            frame(f'{subdir}/front2.gif', xflip=True, tick=23, dx=-5 * Game.scx,  dy=3 * Game.scy),
-            frame(f'{subdir}/front3.gif', xflip=True, tick=30, dx=-22 * Game.scx, dy=18 * Game.scy),
-            frame(f'{subdir}/front2.gif', xflip=True, tick=46, dx=-5 * Game.scx,  dy=3 * Game.scy),
-            # @formatter:on
-        ], actions=[
-            Act(tick=5, act=Actions.snd, snd='epee.ogg'),
-        ]),
-        'retourne': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/retourne1.gif', xflip=True, tick=5,  mv=(-Game.chw, 0), dx=4 * Game.scx, dy=14 * Game.scy),
-            frame(f'{subdir}/retourne2.gif', xflip=True, tick=10, mv=(-Game.chw, 0),                  dy=13 * Game.scy),
-            frame(f'{subdir}/retourne3.gif', xflip=True, tick=18, mv=(-Game.chw, 0), dx=2 * Game.scx, dy=14 * Game.scy),
-            # @formatter:on
-        ]),
-        'vainqueur': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/vainqueur1.gif', xflip=True, tick=18,  dx=-4 * Game.scx, dy=17 * Game.scy),
-            frame(f'{subdir}/vainqueur2.gif', xflip=True, tick=35,  dx=-2 * Game.scx, dy=8 * Game.scy),
-            frame(f'{subdir}/vainqueur3.gif', xflip=True, tick=85,  dx=-0 * Game.scx, dy=10.1 * Game.scy),
-            frame(f'{subdir}/vainqueur2.gif', xflip=True, tick=100, dx=-2 * Game.scx, dy=8 * Game.scy),
-            frame(f'{subdir}/vainqueur1.gif', xflip=True, tick=101, dx=-4 * Game.scx, dy=17 * Game.scy),
-            # @formatter:on
-        ], actions=[
-            Act(tick=102, act=Actions.stop),
-        ]),
-        'vainqueurKO': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/retourne1.gif',  xflip=True, tick=15,  dx=4 * Game.scx,  dy=14 * Game.scy),
-            frame(f'{subdir}/retourne2.gif',  xflip=True, tick=23,                    dy=13 * Game.scy),
-            frame(f'{subdir}/retourne3.gif',  xflip=True, tick=30,  dx=2 * Game.scx,  dy=14 * Game.scy),
-            frame(f'{subdir}/debout.gif',     xflip=True, tick=40,                    dy=18 * Game.scy),
-            frame(f'{subdir}/marche3.gif',                tick=40,  dx=8 * Game.scx,  dy=18 * Game.scy),  # optional frame, see gestion on tick 35
-            frame(f'{subdir}/marche3.gif',    xflip=True, tick=40,                    dy=18 * Game.scy),  # optional frame, see gestion on tick 35
-            frame(f'{subdir}/debout.gif',     xflip=True, tick=55,                    dy=18 * Game.scy),
-            frame(f'{subdir}/pied1.gif',      xflip=True, tick=70,  dx=-3 * Game.scx, dy=17 * Game.scy),
-            frame(f'{subdir}/pied2.gif',      xflip=True, tick=75,  dx=-8 * Game.scx, dy=17 * Game.scy),
-            frame(f'{subdir}/pied1.gif',      xflip=True, tick=100, dx=-3 * Game.scx, dy=17 * Game.scy),
-            frame(f'{subdir}/debout.gif',     xflip=True, tick=105,                   dy=18 * Game.scy),
-            frame(f'{subdir}/vainqueur1.gif', xflip=True, tick=123, dx=-4 * Game.scx, dy=17 * Game.scy),
-            frame(f'{subdir}/vainqueur2.gif', xflip=True, tick=140, dx=-2 * Game.scx, dy=8 * Game.scy),
-            frame(f'{subdir}/vainqueur3.gif', xflip=True, tick=195,                   dy=10.1 * Game.scy),
-            frame(f'{subdir}/vainqueur2.gif', xflip=True, tick=205, dx=-2 * Game.scx, dy=8 * Game.scy),
-            frame(f'{subdir}/vainqueur1.gif', xflip=True, tick=231, dx=-4 * Game.scx, dy=17 * Game.scy),
-            # @formatter:oon
-        ], actions=[
-            Act(tick=232, act=Actions.stop),
-        ]),
-        'touche1': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/touche2.gif', xflip=True, tick=1,                        dx=2 * Game.scx, dy=20 * Game.scy),  # noqa
-            frame(f'{subdir}/touche2.gif', xflip=True, tick=5,  mv=(Game.chw,     0), dx=2 * Game.scx, dy=20 * Game.scy),  # noqa
-            frame(f'{subdir}/touche1.gif', xflip=True, tick=10, mv=(2 * Game.chw, 0), dx=6 * Game.scx, dy=21 * Game.scy),  # noqa
-            frame(f'{subdir}/touche2.gif', xflip=True, tick=20, mv=(Game.chw,     0), dx=2 * Game.scx, dy=20 * Game.scy),  # noqa
-            frame(f'{subdir}/debout.gif',  xflip=True, tick=21, dy=18 * Game.scy),
-            # @formatter:on
-        ]),
-        'tombe1': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/tombe1.gif', xflip=True, tick=1,                    dx=4 * Game.scx,  dy=21 * Game.scy),
-            frame(f'{subdir}/tombe1.gif', xflip=True, tick=9,  mv=(Game.chw, 0), dx=4 * Game.scx,  dy=21 * Game.scy),
-            frame(f'{subdir}/tombe2.gif', xflip=True, tick=15, mv=(Game.chw, 0), dx=10 * Game.scx, dy=58 * Game.scy),
-            frame(f'{subdir}/tombe3.gif', xflip=True, tick=25,                   dx=8 * Game.scx,  dy=41 * Game.scy),
-            frame(f'{subdir}/debout.gif', xflip=True, tick=27, mv=(Game.chw, 0),                   dy=18 * Game.scy),
-            # @formatter:on
-        ]),
-        'mort': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/assis1.gif', xflip=True, tick=15, dy=26 * Game.scy),
-            frame(f'{subdir}/mort2.gif',  xflip=True, tick=17, dx=-6 * Game.scx, dy=54 * Game.scy),
-            frame(f'{subdir}/mort3.gif',  xflip=True, tick=18,                   dy=52 * Game.scy),  # manual, see vainqueurKO
-            frame(f'{subdir}/mort4.gif',  xflip=True, tick=19, dx=-1 * Game.scx, dy=66 * Game.scy),  # manual, see vainqueurKO
-            # @formatter:on
-        ], actions=[
-            Act(tick=1, act=Actions.snd, snd='mortKO.ogg'),
-            Act(tick=17, act=Actions.stop),
-        ]),
-        'mortdecap': Animation(frames=[
-            frame(f'{subdir}/decap1.gif', xflip=True, tick=35, dx=2 * Game.scx, dy=30 * Game.scy),
-            frame(f'{subdir}/decap2.gif', xflip=True, tick=70, dx=-22 * Game.scx, dy=45 * Game.scy),
-            frame(f'{subdir}/decap3.gif', xflip=True, tick=80, dx=-32 * Game.scx, dy=53 * Game.scy),
-            frame(f'{subdir}/decap4.gif', xflip=True, tick=82, dx=-43 * Game.scx, dy=68 * Game.scy),
-        ], actions=[
-            Act(tick=1, act=Actions.snd, snd='mortdecap.ogg'),
-            Act(tick=82, act=Actions.stop),
-        ]),
-        'mortgnome': Animation(frames=[
-            frame(f'{subdir}/mort4.gif', xflip=True, tick=0, mv=(Game.chw / 12, 0)),
-        ]),
-        'mortdecapgnome': Animation(frames=[
-            frame(f'{subdir}/decap4.gif', xflip=True, tick=0, mv=(Game.chw / 12, 0)),
-        ]),
-        'mortSORCIER': Animation(frames=[
-            # @formatter:off
-            frame(f'{subdir}/assis1.gif', xflip=True, tick=15, dy=26 * Game.scy),
-            frame(f'{subdir}/mort2.gif',  xflip=True, tick=70, dx=-6 * Game.scx, dy=54 * Game.scy),
-            frame(f'{subdir}/mort3.gif',  xflip=True, tick=85,                   dy=52 * Game.scy),
-            frame(f'{subdir}/mort4.gif',  xflip=True, tick=87, dx=-1 * Game.scx, dy=66 * Game.scy),
-            # @formatter:on
-        ], actions=[
-            Act(tick=88, act=Actions.stop),
-        ]),
-    }
+    anims = mirror(barb(subdir), 40 * Game.scx, fixes={
+        # hand-tuned frames, not the plain mirror of barb
+        # @formatter:off
+        'attente': {1: dict(dx=-4 * Game.scx), 2: dict(dx=-4 * Game.scx),
+                    3: dict(dx=-4 * Game.scx)},
+        'saute': {2: dict(dx=-5 * Game.scx)},
+        'rouladeAV': {4: dict(xflip=False), 5: dict(xflip=False),
+                      8: dict(xflip=False), 9: dict(xflip=False),
+                      10: dict(dx=4 * Game.scx)},
+        'rouladeAV-out': {0: dict(xflip=False), 1: dict(xflip=False),
+                          4: dict(xflip=False), 5: dict(xflip=False)},
+        'rouladeAR': {1: dict(xflip=False), 4: dict(xflip=False),
+                      5: dict(xflip=False)},
+        'coupdetete': {1: dict(dx=2 * Game.scx, mv=(-Game.chw, 0)),
+                       2: dict(mv=None),
+                       3: dict(dx=2 * Game.scx, mv=None),
+                       4: dict(mv=(Game.chw, 0))},
+        'vainqueur': {0: dict(xflip=True, dx=-4 * Game.scx),
+                      1: dict(xflip=True, dx=-2 * Game.scx),
+                      2: dict(xflip=True),
+                      3: dict(xflip=True, dx=-2 * Game.scx),
+                      4: dict(xflip=True, dx=-4 * Game.scx)},
+        'vainqueurKO': {4: dict(xflip=False, dx=8 * Game.scx),  # optional frames,
+                        5: dict(xflip=True, dx=0),              # see gestion on tick 35
+                        11: dict(xflip=True, dx=-4 * Game.scx),
+                        12: dict(xflip=True, dx=-2 * Game.scx),
+                        13: dict(xflip=True),
+                        14: dict(xflip=True, dx=-2 * Game.scx),
+                        15: dict(xflip=True, dx=-4 * Game.scx)},
+        'tombe1': {0: dict(dx=4 * Game.scx), 1: dict(dx=4 * Game.scx)},
+        'mort': {2: dict(dx=0), 3: dict(dx=-1 * Game.scx)},  # manual, see vainqueurKO
+        'mortdecap': {0: dict(dx=2 * Game.scx), 1: dict(dx=-22 * Game.scx),
+                      2: dict(dx=-32 * Game.scx), 3: dict(dx=-43 * Game.scx)},
+        'mortgnome': {0: dict(dx=0, mv=(Game.chw / 12, 0))},
+        'mortdecapgnome': {0: dict(dx=0, mv=(Game.chw / 12, 0))},
+        # @formatter:on
+    })
+    anims['mortSORCIER'] = Animation(frames=[
+        # @formatter:off
+        frame(f'{subdir}/assis1.gif', xflip=True, tick=15, dy=26 * Game.scy),
+        frame(f'{subdir}/mort2.gif',  xflip=True, tick=70, dx=-6 * Game.scx, dy=54 * Game.scy),
+        frame(f'{subdir}/mort3.gif',  xflip=True, tick=85,                   dy=52 * Game.scy),
+        frame(f'{subdir}/mort4.gif',  xflip=True, tick=87, dx=-1 * Game.scx, dy=66 * Game.scy),
+        # @formatter:on
+    ], actions=[
+        Act(tick=88, act=Actions.stop),
+    ])
+    return anims
 
 
+@anim_table
 def gnome():
     return {
         'gnome': Animation(frames=[
@@ -889,6 +659,7 @@ def gnome():
     }
 
 
+@anim_table
 def feu():
     return {
         'feu_low': Animation(frames=[
@@ -972,6 +743,7 @@ def feu():
     }
 
 
+@anim_table
 def sorcier():
     return {
         'debout': Animation(frames=[
@@ -0,0 +1,1376 @@
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import math
+import mmap
+import os
+import shutil
+import struct
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from itertools import repeat
+from os.path import join, dirname, basename, relpath
+from pathlib import Path
+from typing import (
+    Optional, Tuple, Union, Dict, List, Iterable, Callable, Iterator
+)
+
+import pygame
+from pygame import Surface, Rect, image, mask, mixer
+from pygame.mixer import Sound  # import pygame.Sound breaks WASM!!!
+from pygame.transform import scale
+
+from barbariantuw import (
+    BASE_PATH, IMG_PATH, SND_PATH, FONT_PATH, Game, appdata
+)
+
+DISK_CACHE_VERSION = 2
+PCM_CACHE_VERSION = 1
+MIXER = (44100, -16, 2)  # frequency, size, channels of the Ogg sources
+SND_STREAM_MIN = 16 * 1024  # bigger Ogg sources are streamed, see `Stream`
+ATLAS_VERSION = 2
+ATLAS_DIRS = ('sprites', 'spritesA', 'spritesB/spritesB0', 'stage')
+ATLAS_IMG = 'atlas.png'
+ATLAS_IDX = 'atlas.json'
+ATLAS_SCALED = ('sprites', 'spritesA', 'spritesB/spritesB0')  # `Atlas.scaled`
+PALETTE_VERSION = 2
+PALETTE_BASE = 'spritesB/spritesB0'
+PALETTE_DIRS = tuple(f'spritesB/spritesB{i}' for i in range(1, 8))
+PALETTE_IDX = 'spritesB/palettes.json'
+PAK_VERSION = 4
+PAK_PATH = join(BASE_PATH, 'assets.pak')
+PAK_RAW_MAX = 256 * 1024  # bigger raw images are stored as PNG
+BUNDLES = tuple(f'spritesB{i}' for i in range(1, 8))  # web, `fetch_bundle`
+BUNDLE_DIR = join(dirname(BASE_PATH), 'build', 'bundles')
+COLORKEYS = ((255, 0, 255), (0, 255, 255), (1, 2, 3))  # the first unused
+MANIFEST_VERSION = 2
+MANIFEST_PATH = join(BASE_PATH, 'manifest.json')
+BUILT = (ATLAS_IMG, ATLAS_IDX, basename(PALETTE_IDX))  # not source assets
+
+
+def file_sha1(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def asset_key(path: str) -> str:
+    """
+    Package relative path, the `Pak` and `Manifest` key.
+    """
+    if path.startswith(BASE_PATH + os.sep):
+        key = path[len(BASE_PATH) + 1:]
+    else:
+        key = relpath(path, BASE_PATH)
+    return key.replace(os.sep, '/')
+
+
+def source_stamp(path: str) -> dict:
+    """
+    Size 's', mtime 'm' and content 'sha1' of the source file, see `stale`.
+    """
+    st = os.stat(path)
+    return {'s': st.st_size, 'm': st.st_mtime_ns, 'sha1': file_sha1(path)}
+
+
+def stale(path: str, stamp: dict) -> bool:
+    """
+    The loose file changed since its `source_stamp`: another size, or
+    another mtime and content (a checkout or an install touches the mtime
+    only). Not stale if shipped without the loose file.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return st.st_size != stamp['s'] or (st.st_mtime_ns != stamp['m']
+                                        and file_sha1(path) != stamp['sha1'])
+
+
+class AssetIndex:
+    """
+    {asset key: entry} with the `source_stamp` of the source. A changed
+    loose file of the development tree is not in the index, see `stale`.
+    """
+
+    def __init__(self, index: Dict[str, dict]):
+        self.index = index
+        self._fresh: Dict[str, Optional[dict]] = {}
+
+    def entry(self, path: str) -> Optional[dict]:
+        if (e := self._fresh.get(path)) is not None or path in self._fresh:
+            return e
+        e = self.index.get(asset_key(path))
+        if e is not None and stale(path, e):
+            e = None  # edited loose file
+        self._fresh[path] = e
+        return e
+
+    def forget(self):
+        """
+        Checks the loose files again, see `unload`.
+        """
+        self._fresh.clear()
+
+
+class Pak(AssetIndex):
+    """
+    Packed assets, see `build_pak`: the header, JSON index and data blobs,
+    memory-mapped. Images are stored in the fastest to decode format,
+    see `pak_image`: 'P' - 8-bit indices of the shared palette, 'RGB',
+    'RGBA' for `image.frombuffer`, 'PNG' for the big ones, with the opaque
+    bounds of the sprites with transparent margins. The recoloured opponent
+    poses keep their palette only, the pixels are of the 'base' entry, see
+    `pak_swaps`. Sounds as is, the short ones also as 'pcm' of the `MIXER`
+    format, see `Stream`. Other files as is.
+    A changed loose file of the development tree overrides its entry.
+    The web build core pak lists the `bundles` to fetch and `mount`.
+    """
+    MAGIC = b'BTPK'
+    HEADER = struct.Struct('<4sHI')  # magic, version, index size
+    ALIGN = 16
+
+    def __init__(self, path: str, data, base: int, index: dict):
+        super().__init__(index['files'])
+        self.path = path
+        self.mtime = os.stat(path).st_mtime_ns
+        self.chunks = [(memoryview(data), base)]  # blob offsets start
+        self.palettes: List = index['palettes']  # hex, decoded on demand
+        self.sources: Optional[str] = index.get('sources')  # see `build`
+        self.mixer = tuple(index.get('mixer', ()))  # of the sound 'pcm'
+        self.bundles = set(index.get('bundles', ()))  # not mounted yet
+
+    @staticmethod
+    def align(offset: int) -> int:
+        return -(-offset // Pak.ALIGN) * Pak.ALIGN
+
+    @staticmethod
+    def load(path: str = PAK_PATH) -> Optional['Pak']:
+        try:
+            with open(path, 'rb') as f:
+                try:  # copy on write, frombuffer wants a writable buffer
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                except (OSError, ValueError):  # WASM
+                    data = f.read()
+        except OSError:
+            return None  # development tree, loose files
+        magic, ver, size = Pak.HEADER.unpack_from(data)
+        if magic != Pak.MAGIC or ver != PAK_VERSION:
+            print(f'pak {path} is not supported')
+            return None
+        start = Pak.HEADER.size
+        index = json.loads(bytes(data[start:start + size]))
+        return Pak(path, data, Pak.align(start + size), index)
+
+    def close(self):
+        """
+        Unmaps the files, see `build_pak`: Windows cannot replace a mapped
+        file. No blob or image of them may be left.
+        """
+        for view, _ in self.chunks:
+            data = view.obj
+            view.release()
+            if isinstance(data, mmap.mmap):
+                data.close()
+        self.chunks.clear()
+
+    def blob(self, e: dict) -> memoryview:
+        data, base = self.chunks[e.get('d', 0)]
+        offset = base + e['o']
+        return data[offset:offset + e['n']]
+
+    def mount(self, name: str, bundle: 'Pak'):
+        """
+        Adds the entries of the bundle pak, see `build_bundles`.
+        """
+        chunk, pal = len(self.chunks), len(self.palettes)
+        self.chunks.extend(bundle.chunks)
+        self.palettes.extend(bundle.palettes)
+        for e in bundle.index.values():
+            e['d'] = chunk
+            if 'p' in e:
+                e['p'] += pal
+            if 'pcm' in e:
+                e['pcm']['d'] = chunk
+        self.index.update(bundle.index)
+        self.bundles.discard(name)
+        self.forget()
+
+    def image(self, e: dict) -> Surface:
+        size, fmt = (e['w'], e['h']), e['f']
+        if fmt == 'PNG':
+            return image.load(io.BytesIO(self.blob(e)), 'pak.png')
+        if fmt != 'P':
+            return image.frombuffer(self.blob(e), size, fmt)
+        pixels = self.index[e['base']] if 'base' in e else e
+        img = image.frombuffer(self.blob(pixels), size, 'P')
+        if isinstance(pal := self.palettes[e['p']], str):
+            rgb = bytes.fromhex(pal)
+            pal = self.palettes[e['p']] = list(zip(rgb[0::3], rgb[1::3],
+                                                   rgb[2::3]))
+        img.set_palette(pal)
+        if e['k'] >= 0:
+            img.set_colorkey(e['k'])
+        return img
+
+
+pak = Pak.load()
+_fetches: Dict[str, asyncio.Future] = {}
+
+
+def close_pak():
+    """
+    Drops the pak of the package, the build reads the loose files.
+    """
+    global pak
+    if pak:
+        pak.close()
+        pak = None
+
+
+async def fetch_bundle(name: str):
+    """
+    Mounts the bundle into the `pak`. The web build fetches it from the
+    page directory, others read it next to the pak. A failed one is
+    dropped, the loose files are used.
+    """
+    path = join(dirname(pak.path), f'{name}.pak')
+    try:
+        if sys.platform == 'emscripten':
+            import platform  # pygbag
+            async with platform.fopen(f'{name}.pak', 'rb') as f:
+                f.rename_to(path)
+        if not (bundle := Pak.load(path)):
+            raise OSError(f'no {path}')
+        with _lock:
+            pak.mount(name, bundle)
+    except Exception as ex:
+        print(f'bundle error: {ex}')
+        pak.bundles.discard(name)
+
+
+def fetch_bundles(names: List[str]) -> List[asyncio.Future]:
+    """
+    Starts fetching the bundles in the background, returns the pending
+    ones of `names`.
+    """
+    for name in names:
+        if name not in _fetches:
+            _fetches[name] = asyncio.ensure_future(fetch_bundle(name))
+    return [_fetches[name] for name in names if not _fetches[name].done()]
+
+
+def stage_bundles(ia: int) -> List[str]:
+    """
+    Not mounted bundles of the stage opponent.
+    """
+    name = f'spritesB{ia}'
+    return [name] if pak and name in pak.bundles else []
+
+
+class Manifest(AssetIndex):
+    """
+    Size 's', mtime 'm', content 'sha1', decoded image size 'w', 'h' and
+    opaque bounds 'b' of every source asset, see `build_manifest`.
+    """
+
+    @staticmethod
+    def load(path: str = MANIFEST_PATH) -> Optional['Manifest']:
+        try:
+            idx = json.loads(read_file(path))
+        except OSError:
+            return None  # not built
+        if idx.get('version') != MANIFEST_VERSION:
+            return None
+        return Manifest(idx['files'])
+
+
+def open_img(path: str) -> Surface:
+    """
+    Decoded image of the pak or the loose file.
+    """
+    if pak and (e := pak.entry(path)) and 'w' in e:
+        return pak.image(e)
+    return image.load(path)
+
+
+class Stream:
+    """
+    Long sound played by `mixer.music`, decoded chunk by chunk while it
+    plays instead of kept as PCM. One plays at a time, the started stream
+    stops the playing one.
+    """
+    playing: Optional['Stream'] = None
+
+    def __init__(self, path: str, data: Optional[memoryview] = None):
+        self.path = path
+        self.data = data  # pak blob, the loose file otherwise
+
+    def play(self):
+        if self.data is None:
+            mixer.music.load(self.path)
+        else:
+            mixer.music.load(io.BytesIO(self.data), basename(self.path))
+        mixer.music.play()
+        Stream.playing = self
+
+    def stop(self):
+        if Stream.playing is self:
+            mixer.music.stop()
+            mixer.music.unload()
+            Stream.playing = None
+
+
+def open_snd(path: str) -> Union[Sound, Stream]:
+    """
+    `Stream` of the long sound. Sound of the mixer-native PCM of the pak
+    or of the `pcm_cache`, otherwise decoded and resampled once.
+    """
+    e = pak and pak.entry(path)
+    if file_stamp(path)[0] > SND_STREAM_MIN:
+        return Stream(path, pak.blob(e) if e else None)
+    if (pcm := e and e.get('pcm')) and pak.mixer == mixer.get_init():
+        return Sound(buffer=pak.blob(pcm))
+    if (snd := pcm_cache.load(path)) is not None:
+        return snd
+    snd = Sound(file=io.BytesIO(pak.blob(e))) if e else Sound(path)
+    pcm_cache.save(path, snd)
+    return snd
+
+
+def read_file(path: str) -> bytes:
+    if pak and (e := pak.entry(path)) and 'base' not in e:
+        return bytes(pak.blob(e))
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+manifest = Manifest.load()
+
+
+def file_stamp(path: str) -> Tuple[int, int]:
+    """
+    (size, content hash) of the manifest entry, otherwise (size, mtime)
+    of the pak entry or of the loose file.
+    """
+    if manifest and (e := manifest.entry(path)):
+        return e['s'], int(e['sha1'][:15], 16)
+    if pak and (e := pak.entry(path)):
+        return e['s'], pak.mtime
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+class DiskCache:
+    """
+    Scaled images stored as raw RGBA blobs, one file per (image key, scale).
+    The source `file_stamp` is kept in the blob header, so a changed
+    source image invalidates the entry. Disabled for WASM.
+    """
+    MAGIC = b'BTUW'
+    HEADER = struct.Struct('<4sHIIqq')  # magic, version, w, h, stamp
+    PREFIX = 'img'
+    VERSION = DISK_CACHE_VERSION
+
+    def __init__(self, root: Union[Path, str]):
+        self.enabled = sys.platform != 'emscripten'
+        self.root = Path(root) / f'{self.PREFIX}-v{self.VERSION}'
+        self._prepared = False
+        self._lock = threading.Lock()
+
+    def _path(self, key: tuple) -> Path:
+        # the key holds the scale, pygame version affects the scaled pixels
+        digest = hashlib.sha1(repr((key, pygame.version.ver)).encode())
+        return self.root / f'{digest.hexdigest()}.raw'
+
+    @staticmethod
+    def _stamp(name: str) -> Optional[Tuple[int, int]]:
+        if name in ('empty', 'fill'):
+            return None  # generated images, nothing to save
+        try:
+            return file_stamp(join(IMG_PATH, name))
+        except OSError:
+            return None
+
+    def load(self, key: tuple) -> Optional[Surface]:
+        if not self.enabled:
+            return None
+        stamp = self._stamp(key[0])
+        if not stamp:
+            return None
+        try:
+            data = self._path(key).read_bytes()
+        except OSError:
+            return None
+        if len(data) < self.HEADER.size:
+            return None
+        magic, ver, w, h, *saved = self.HEADER.unpack_from(data)
+        if (magic != self.MAGIC or ver != self.VERSION
+                or tuple(saved) != stamp
+                or len(data) != self.HEADER.size + w * h * 4):
+            return None
+        img = image.frombuffer(memoryview(data)[self.HEADER.size:], (w, h),
+                               'RGBA')
+        return img.convert_alpha()
+
+    def save(self, key: tuple, img: Surface):
+        if not self.enabled:
+            return
+        stamp = self._stamp(key[0])
+        if not stamp:
+            return
+        try:
+            self._prepare()
+            path = self._path(key)
+            tmp = path.with_suffix(
+                f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            w, h = img.get_size()
+            with open(tmp, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION,
+                                         w, h, *stamp))
+                f.write(image.tobytes(img, 'RGBA'))
+            os.replace(tmp, path)
+        except Exception as ex:
+            print(f'disk cache error: {ex}')
+            self.enabled = False
+
+    def _prepare(self):
+        with self._lock:  # preloader threads
+            if self._prepared:
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            for old in self.root.parent.glob(f'{self.PREFIX}-v*'):
+                if old != self.root:
+                    shutil.rmtree(old, ignore_errors=True)
+            self._prepared = True
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._prepared = False
+
+
+disk_cache = DiskCache(appdata('cache'))
+
+
+class PcmCache(DiskCache):
+    """
+    Decoded sounds as the raw PCM of the mixer format, one file per
+    (sound, format), loaded by `Sound(buffer=)` from a memory map with no
+    Vorbis decoding and resampling. The source `file_stamp` is kept in
+    the header. Disabled for WASM.
+    """
+    MAGIC = b'BTSN'
+    HEADER = struct.Struct('<4sHqq')  # magic, version, stamp
+    PREFIX = 'snd'
+    VERSION = PCM_CACHE_VERSION
+
+    def _path(self, path: str) -> Path:
+        digest = hashlib.sha1(repr((asset_key(path), mixer.get_init(),
+                                    pygame.version.ver)).encode())
+        return self.root / f'{digest.hexdigest()}.pcm'
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            return file_stamp(path)
+        except OSError:
+            return None
+
+    def load(self, path: str) -> Optional[Sound]:
+        if not self.enabled or not (stamp := self._stamp(path)):
+            return None
+        try:
+            with open(self._path(path), 'rb') as f, mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if len(data) <= self.HEADER.size:
+                    return None
+                magic, ver, *saved = self.HEADER.unpack_from(data)
+                if (magic != self.MAGIC or ver != self.VERSION
+                        or tuple(saved) != stamp):
+                    return None
+                with memoryview(data) as view, \
+                        view[self.HEADER.size:] as pcm:
+                    return Sound(buffer=pcm)  # copies
+        except (OSError, ValueError):
+            return None
+
+    def save(self, path: str, snd: Sound):
+        if not self.enabled or not (stamp := self._stamp(path)):
+            return
+        try:
+            self._prepare()
+            dst = self._path(path)
+            tmp = dst.with_suffix(
+                f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            with open(tmp, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, *stamp))
+                f.write(snd.get_raw())
+            os.replace(tmp, dst)
+        except Exception as ex:
+            print(f'pcm cache error: {ex}')
+            self.enabled = False
+
+
+pcm_cache = PcmCache(appdata('cache'))
+
+
+class Atlas:
+    """
+    All images of the `subdir` packed into one surface, see `build_atlas`.
+    """
+
+    def __init__(self, subdir: str, surface: Surface, rects: Dict[str, Rect]):
+        self.subdir = subdir
+        self.surface = surface
+        self.rects = rects
+        self._scaled: Optional[Tuple[int, int, weakref.ref]] = None
+
+    def __contains__(self, name: str):
+        return name in self.rects
+
+    def subsurface(self, name: str) -> Surface:
+        return self.surface.subsurface(self.rects[name])
+
+    def scaled(self, name: str,
+               scale_: Tuple[float, float]) -> Optional[Surface]:
+        """
+        Subsurface of the atlas scaled as a whole, integer scale only,
+        otherwise rounding would differ from the image scaled alone.
+        The scaled atlas lives as long as its subsurfaces, the image cache
+        charges it, see `ImgCache`. The stage images are scaled alone, one
+        decor is released at a time.
+        """
+        scx, scy = scale_
+        if (self.subdir not in ATLAS_SCALED
+                or scx != int(scx) or scy != int(scy)):
+            return None
+        scx, scy = int(scx), int(scy)
+        with _lock:
+            scaled = None
+            if self._scaled and self._scaled[:2] == (scx, scy):
+                scaled = self._scaled[2]()
+            if scaled is None:
+                w, h = self.surface.get_size()
+                scaled = blit_format(scale(self.surface, (w * scx, h * scy)))
+                self._scaled = (scx, scy, weakref.ref(scaled))
+        r = self.rects[name]
+        return blit_format(scaled.subsurface((r.x * scx, r.y * scy,
+                                              r.w * scx, r.h * scy)))
+
+    @staticmethod
+    def load(subdir: str, img_path: str = IMG_PATH) -> Optional['Atlas']:
+        root = join(img_path, subdir)
+        try:
+            idx = json.loads(read_file(join(root, ATLAS_IDX)))
+        except OSError:
+            return None  # not built, loose files
+        if idx.get('version') != ATLAS_VERSION:
+            return None
+        rects = {}
+        for name, (x, y, w, h, stamp) in idx['frames'].items():
+            if stale(join(root, name), stamp):
+                print(f'atlas {subdir} is stale: {name}')
+                return None
+            rects[name] = Rect(x, y, w, h)
+        surface = open_img(join(root, ATLAS_IMG)).convert_alpha()
+        return Atlas(subdir, surface, rects)
+
+
+atlases: Dict[str, Optional[Atlas]] = {}
+img_sizes: Dict[str, Tuple[int, int]] = {}
+_lock = threading.RLock()  # preloader threads
+
+
+def get_atlas(name: str) -> Optional[Atlas]:
+    subdir = dirname(name)
+    if subdir not in ATLAS_DIRS:
+        return None
+    with _lock:
+        if subdir not in atlases:
+            atlases[subdir] = Atlas.load(subdir)
+        atlas = atlases[subdir]
+    return atlas if atlas and basename(name) in atlas else None
+
+
+def release_atlas(subdir: str):
+    with _lock:
+        atlases.pop(subdir, None)
+
+
+palettes: Optional[Dict[str, List[Tuple[int, int, int]]]] = None
+bases: Dict[str, Tuple[Surface, int]] = {}  # 8-bit PALETTE_BASE, colorkey
+
+
+def get_palette(name: str) -> Optional[List[Tuple[int, int, int]]]:
+    global palettes
+    if dirname(name) not in PALETTE_DIRS:
+        return None
+    with _lock:
+        if palettes is None:
+            palettes = load_palettes()
+    return palettes.get(name)
+
+
+def load_palettes(img_path: str = IMG_PATH) -> Dict[str, List]:
+    """
+    {image name: palette} of `build_palettes`, empty if not built or stale.
+    """
+    try:
+        idx = json.loads(read_file(join(img_path, PALETTE_IDX)))
+    except OSError:
+        return {}
+    if idx.get('version') != PALETTE_VERSION:
+        return {}
+    pals = [[tuple(rgb[i:i + 3]) for i in range(0, len(rgb), 3)]
+            for rgb in map(bytes.fromhex, idx['palettes'])]
+    table = {}
+    for name, (pal, stamp, base_stamp) in idx['files'].items():
+        base = join(PALETTE_BASE, basename(name))
+        if (stale(join(img_path, name), stamp)
+                or stale(join(img_path, base), base_stamp)):
+            print(f'palette of {name} is stale')
+            continue
+        table[name] = pals[pal]
+    return table
+
+
+def swapped_img(name: str) -> Optional[Surface]:
+    """
+    Opponent image as the 8-bit base pose with the opponent palette of the
+    pak entry or of `build_palettes`, converted once scaled, see
+    `blit_format`. The colorkey index gets an rgb unused by the palette.
+    """
+    if pak and (e := pak.entry(join(IMG_PATH, name))) and 'base' in e:
+        img, key = pak.image(e), e['k']  # no copy, shares the base pixels
+    elif (pal := get_palette(name)) is not None:
+        base_name = join(PALETTE_BASE, basename(name))
+        with _lock:
+            if (base := bases.get(base_name)) is None:
+                img = open_img(join(IMG_PATH, base_name))
+                base = bases[base_name] = img, colorkey_index(img)
+        img, key = base[0].copy(), base[1]
+        img.set_palette(pal)
+    else:
+        return None
+    if key >= 0:
+        pal = img.get_palette()
+        if (rgb := next((c for c in COLORKEYS if c not in pal), None)
+                ) is None:
+            return img.convert_alpha()
+        img.set_palette_at(key, rgb)
+        img.set_colorkey(key)
+    return img
+
+
+def unload():
+    """
+    Forgets the loaded atlases, palettes and sizes, see viewer reload.
+    """
+    global palettes
+    with _lock:
+        for index in (pak, manifest):
+            if index:
+                index.forget()
+        atlases.clear()
+        bases.clear()
+        img_sizes.clear()
+        palettes = None
+
+
+def blit_format(img: Surface) -> Surface:
+    """
+    Display format of the scaled image for the fastest blit:
+    binary transparency (all the Amiga art) - the colorkey and RLEACCEL,
+    opaque - no alpha, per-pixel alpha for partial transparency only.
+    """
+    if not img.get_flags() & pygame.SRCALPHA:
+        if img.get_bitsize() == 8:  # unique colorkey rgb, see `swapped_img`
+            img = img.convert()
+        if (key := img.get_colorkey()) is not None:  # subsurface
+            img.set_colorkey(key, pygame.RLEACCEL)
+        return img
+    opaque = mask.from_surface(img, 254).count()
+    if opaque != mask.from_surface(img, 0).count():
+        return img  # semi-transparent pixels
+    w, h = img.get_size()
+    if opaque == w * h:
+        return img.convert()
+    for key in COLORKEYS:
+        if not mask.from_threshold(img, key, (1, 1, 1, 255)).count():
+            break
+    else:
+        return img  # all the keys are used by opaque pixels
+    out = Surface((w, h)).convert()
+    out.fill(key)
+    out.blit(img, (0, 0))
+    out.set_colorkey(key, pygame.RLEACCEL)
+    return out
+
+
+def load_img(name: str, colorkey: Tuple[int, int, int] = None) -> Surface:
+    """
+    Unscaled image in the display format from the atlas, the palette swap
+    or the loose file.
+    """
+    if not colorkey and (img := swapped_img(name)):
+        return img
+    if atlas := get_atlas(name):
+        img = atlas.subsurface(basename(name))
+        if not colorkey:
+            return img
+        img = img.convert()  # atlas keeps rgb of the transparent pixels
+    else:
+        img = open_img(join(IMG_PATH, name))
+    if colorkey:
+        img.set_colorkey(colorkey)
+    return img.convert_alpha()
+
+
+def img_size(name: str) -> Tuple[int, int]:
+    """
+    Unscaled image size from the pak index, the manifest or the GIF/PNG
+    header, without decoding.
+    """
+    if (size := img_sizes.get(name)) is not None:
+        return size
+    path = join(IMG_PATH, name)
+    if ((pak and (e := pak.entry(path)))
+            or (manifest and (e := manifest.entry(path)) and 'w' in e)):
+        img_sizes[name] = size = e['w'], e['h']
+        return size
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(24)
+    except OSError:
+        head = b''
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        size = struct.unpack_from('<HH', head, 6)
+    elif head[:8] == b'\x89PNG\r\n\x1a\n':
+        size = struct.unpack_from('>II', head, 16)
+    else:  # shipped in the atlas only
+        size = load_img(name).get_size()
+    img_sizes[name] = size
+    return size
+
+
+def img_bounds(name: str) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Opaque (x, y, w, h) of the unscaled image from the manifest or the pak
+    index, None - no transparent margins or a loose file. The manifest
+    first: the disk cache of its content-stamped images keeps them trimmed.
+    """
+    path = join(IMG_PATH, name)
+    if ((manifest and (e := manifest.entry(path)))
+            or (pak and (e := pak.entry(path)))):
+        return e.get('b')
+    return None
+
+
+def opaque_bounds(img: Surface) -> Optional[Tuple[int, int, int, int]]:
+    """
+    See `img_bounds`.
+    """
+    bounds = img.convert_alpha().get_bounding_rect()
+    if bounds.w and bounds.size != img.get_size():
+        return tuple(bounds)
+    return None
+
+
+def scaled_img(name: str,
+               scale_: Tuple[float, float]) -> Optional[Surface]:
+    """
+    Untransformed image at the `scale_` (scx, scy) as a subsurface of the
+    scaled atlas.
+    """
+    if atlas := get_atlas(name):
+        return atlas.scaled(basename(name), scale_)
+    return None
+
+
+def init_display():
+    """
+    Hidden display for `convert_alpha` in build tools.
+    """
+    if not pygame.display.get_init():
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.display.init()
+    if not pygame.display.get_surface():
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+
+
+def init_mixer() -> bool:
+    """
+    Mixer of the `MIXER` format for the PCM in build tools, False - none.
+    """
+    if mixer.get_init() != MIXER:
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        try:
+            mixer.quit()
+            mixer.init(*MIXER)
+        except pygame.error as ex:
+            print(f'mixer error: {ex}')
+    return mixer.get_init() == MIXER
+
+
+def pack(sizes: Dict[str, Tuple[int, int]]) -> Tuple[Tuple[int, int],
+                                                    Dict[str, Rect]]:
+    """
+    Shelf packing, tallest images first.
+    """
+    area = sum(w * h for w, h in sizes.values())
+    width = max(max(w for w, _ in sizes.values()),
+                math.ceil(math.sqrt(area) * 1.1))
+    rects = {}
+    x = y = shelf = 0
+    for name, (w, h) in sorted(sizes.items(),
+                               key=lambda it: (-it[1][1], -it[1][0], it[0])):
+        if x + w > width:
+            x, y = 0, y + shelf
+            shelf = 0
+        rects[name] = Rect(x, y, w, h)
+        x += w
+        shelf = max(shelf, h)
+    return (width, y + shelf), rects
+
+
+def manifest_entry(path: str) -> Tuple[str, dict]:
+    """
+    See `Manifest`.
+    """
+    init_display()
+    with open(path, 'rb') as f:
+        data = f.read()
+    e = {'s': len(data), 'm': os.stat(path).st_mtime_ns,
+         'sha1': hashlib.sha1(data).hexdigest()}  # see `source_stamp`
+    if path.endswith(('.gif', '.png')):
+        img = image.load(io.BytesIO(data), basename(path))
+        e['w'], e['h'] = img.get_size()
+        if bounds := opaque_bounds(img):
+            e['b'] = bounds
+    return asset_key(path), e
+
+
+def build_manifest(path: str = MANIFEST_PATH,
+                   roots: Iterable[str] = (IMG_PATH, SND_PATH, FONT_PATH),
+                   map_: Callable = map) -> str:
+    """
+    Indexes the source assets, see `Manifest`.
+    """
+    files = sorted(str(f) for root in roots for f in Path(root).rglob('*')
+                   if f.is_file() and f.name not in BUILT)
+    files = dict(map_(manifest_entry, files))
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as out:
+        json.dump({'version': MANIFEST_VERSION, 'files': files}, out,
+                  separators=(',', ':'))
+    os.replace(tmp, path)
+    print(f'manifest: {path}, {len(files)} files')
+    return path
+
+
+def sources_digest(files: Iterable[Union[Path, str]]) -> str:
+    """
+    sha1 of the names and contents of the build step inputs, the manifest
+    hashes of the sources, stored in the outputs for the incremental build.
+    """
+    digest = hashlib.sha1()
+    for f in sorted(map(str, files)):
+        if manifest and (e := manifest.entry(f)):
+            sha1 = e['sha1']
+        else:  # built or not indexed
+            sha1 = hashlib.sha1(Path(f).read_bytes()).hexdigest()
+        digest.update(f'{asset_key(f)} {sha1}\n'.encode())
+    return digest.hexdigest()
+
+
+def built_from(idx: Optional[dict], sources: str, version: int) -> bool:
+    return (bool(idx) and idx.get('version') == version
+            and idx.get('sources') == sources)
+
+
+def read_idx(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def atlas_files(root: Path) -> List[Path]:
+    return sorted(f for f in root.iterdir()
+                  if f.suffix in ('.gif', '.png') and f.name != ATLAS_IMG)
+
+
+def build_atlas(subdir: str, img_path: str = IMG_PATH,
+                sources: str = None) -> Path:
+    init_display()
+    root = Path(img_path) / subdir
+    files = atlas_files(root)
+    imgs = {f.name: image.load(f).convert_alpha() for f in files}
+    same = {}  # name: first image with the equal pixels
+    unique = {}
+    for name, img in imgs.items():
+        digest = hashlib.sha1(image.tobytes(img, 'RGBA')
+                              + repr(img.get_size()).encode()).digest()
+        same[name] = unique.setdefault(digest, name)
+    size, rects = pack({n: imgs[n].get_size() for n in unique.values()})
+    atlas = Surface(size, pygame.SRCALPHA, 32).convert_alpha()
+    atlas.fill((0, 0, 0, 0))
+    for name in unique.values():
+        # exact copy, transparent pixels keep rgb for the colorkey override
+        atlas.blit(imgs[name], rects[name], special_flags=pygame.BLEND_RGBA_ADD)
+    image.save(atlas, root / ATLAS_IMG)
+    if dups := len(imgs) - len(unique):
+        print(f'atlas {subdir}: {dups} duplicate images share the frames')
+    idx = {'version': ATLAS_VERSION,
+           'sources': sources,
+           'size': size,
+           'frames': {f.name: [*rects[same[f.name]], source_stamp(str(f))]
+                      for f in files}}
+    (root / ATLAS_IDX).write_text(json.dumps(idx, indent=1))
+    return root / ATLAS_IMG
+
+
+def build_atlases(img_path: str = IMG_PATH, map_: Callable = map,
+                  force=False):
+    todo = {}
+    for subdir in ATLAS_DIRS:
+        root = Path(img_path) / subdir
+        sources = sources_digest(atlas_files(root))
+        if (not force and (root / ATLAS_IMG).exists()
+                and built_from(read_idx(root / ATLAS_IDX), sources,
+                               ATLAS_VERSION)):
+            print(f'atlas: {root / ATLAS_IMG} is up to date')
+            continue
+        todo[subdir] = sources
+    for out in map_(build_atlas, todo, repeat(img_path), todo.values()):
+        print(f'atlas: {out}')
+
+
+def palette_swap(base: Surface, img: Surface) -> Optional[List[Tuple]]:
+    """
+    Palette turning the 8-bit `base` into the 8-bit `img` of the same pose,
+    None if the pixels do not map one to one.
+    """
+    if (base.get_bitsize() != 8 or img.get_bitsize() != 8
+            or base.get_size() != img.get_size()):
+        return None
+    src_pal = [tuple(c)[:3] for c in base.get_palette()]
+    img_pal = [tuple(c)[:3] for c in img.get_palette()]
+    base_key = base.map_rgb(base.get_colorkey()) if base.get_colorkey() else -1
+    img_key = img.map_rgb(img.get_colorkey()) if img.get_colorkey() else -1
+    mapping = {}
+    for s, d in zip(image.tobytes(base, 'P'), image.tobytes(img, 'P')):
+        if (s == base_key) != (d == img_key):
+            return None  # other transparent pixels
+        if mapping.setdefault(s, img_pal[d]) != img_pal[d]:
+            return None
+    return [mapping.get(i, rgb) for i, rgb in enumerate(src_pal)]
+
+
+def dir_palettes(subdir: str, img_path: str = IMG_PATH
+                 ) -> Dict[str, Tuple[str, dict, dict]]:
+    """
+    {image name: (palette hex, stamp, base stamp)} of the `subdir` images
+    recoloured from PALETTE_BASE, verified pixel by pixel.
+    """
+    init_display()
+    root = Path(img_path)
+    files = {}
+    for f in sorted((root / subdir).glob('*.gif')):
+        base_file = root / PALETTE_BASE / f.name
+        if not base_file.exists():
+            continue
+        base, img = image.load(base_file), image.load(f)
+        pal = palette_swap(base, img)
+        if pal is None:
+            continue
+        swapped = base.copy()
+        swapped.set_palette(pal)
+        if (image.tobytes(swapped.convert_alpha(), 'RGBA')
+                != image.tobytes(img.convert_alpha(), 'RGBA')):
+            continue
+        files[f'{subdir}/{f.name}'] = (bytes(c for p in pal for c in p).hex(),
+                                       source_stamp(str(f)),
+                                       source_stamp(str(base_file)))
+    return files
+
+
+def build_palettes(img_path: str = IMG_PATH, map_: Callable = map,
+                   force=False) -> Path:
+    """
+    Palettes of the opponent images recoloured from PALETTE_BASE, see
+    `dir_palettes`. Others are loaded from the files.
+    """
+    root = Path(img_path)
+    out = root / PALETTE_IDX
+    sources = sources_digest(f for subdir in (PALETTE_BASE, *PALETTE_DIRS)
+                             for f in (root / subdir).glob('*.gif'))
+    if not force and built_from(read_idx(out), sources, PALETTE_VERSION):
+        print(f'palettes: {out} is up to date')
+        return out
+    pals: List[str] = []
+    files = {}
+    for found in map_(dir_palettes, PALETTE_DIRS, repeat(img_path)):
+        for name, (rgb, stamp, base_stamp) in found.items():
+            if rgb not in pals:
+                pals.append(rgb)
+            files[name] = [pals.index(rgb), stamp, base_stamp]
+    idx = {'version': PALETTE_VERSION, 'sources': sources, 'palettes': pals,
+           'files': files}
+    out.write_text(json.dumps(idx, indent=1))
+    print(f'palettes: {len(files)} images, {len(pals)} palettes')
+    return out
+
+
+def palettized(img: Surface) -> Optional[Surface]:
+    """
+    8-bit copy of the image of up to 256 opaque colors and one
+    transparent, None - more colors or semi-transparent pixels.
+    """
+    rgba = image.tobytes(img, 'RGBA')
+    px = [rgba[i:i + 4] for i in range(0, len(rgba), 4)]
+    colors = list(dict.fromkeys(px))
+    clear = [i for i, c in enumerate(colors) if c[3] != 255]
+    if len(colors) > 256 or len(clear) > 1:
+        return None
+    if clear and colors[clear[0]][3]:  # semi-transparent
+        return None
+    lut = {c: i for i, c in enumerate(colors)}
+    out = image.frombytes(bytes(lut[c] for c in px), img.get_size(), 'P')
+    out.set_palette([tuple(c[:3]) for c in colors])
+    if clear:
+        out.set_colorkey(clear[0])
+    return out
+
+
+def colorkey_index(img: Surface) -> int:
+    """
+    Palette index of the transparent pixels of the 8-bit image, -1 - none.
+    The palette may repeat the colorkey rgb, `map_rgb` may be another one.
+    """
+    if not img.get_colorkey():
+        return -1
+    pixels = image.tobytes(img, 'P')
+    alpha = image.tobytes(img.convert_alpha(), 'RGBA')[3::4]
+    return next((pixels[i] for i, a in enumerate(alpha) if not a), -1)
+
+
+def pak_image(img: Surface) -> Tuple[dict, bytes, Optional[str]]:
+    """
+    Pak entry, pixels and palette hex of the loaded image in the fastest
+    to decode format, see bench_assets.py. Up to 256 colors - 8-bit
+    indices with the colorkey index, the palette trimmed to the used
+    indices is shared by the pak. Others - raw RGB(A), PNG if bigger than
+    `PAK_RAW_MAX`.
+    """
+    w, h = img.get_size()
+    if img.get_bitsize() != 8 and (indexed := palettized(img)):
+        img = indexed
+    if img.get_bitsize() != 8:
+        fmt = 'RGBA' if img.get_flags() & pygame.SRCALPHA else 'RGB'
+        data = image.tobytes(img, fmt)
+        if len(data) > PAK_RAW_MAX:
+            png = io.BytesIO()
+            image.save(img, png, 'pak.png')
+            fmt, data = 'PNG', png.getvalue()
+        return {'f': fmt, 'w': w, 'h': h}, data, None
+    pixels = image.tobytes(img, 'P')
+    key = colorkey_index(img)
+    used = img.get_palette()[:max(pixels) + 1]
+    pal = bytes(c for rgb in used for c in tuple(rgb)[:3]).hex()
+    return {'f': 'P', 'w': w, 'h': h, 'k': key}, pixels, pal
+
+
+def pak_swaps(img_path: str = IMG_PATH) -> Dict[str, Tuple[str, str]]:
+    """
+    {asset key: (base image path, palette hex)} of the opponent images
+    packed as the palette of their PALETTE_BASE pose, see `build_palettes`.
+    """
+    idx = read_idx(Path(img_path) / PALETTE_IDX)
+    if not idx or idx.get('version') != PALETTE_VERSION:
+        return {}
+    return {asset_key(join(img_path, name)):
+            (join(img_path, PALETTE_BASE, basename(name)), idx['palettes'][i])
+            for name, (i, *_) in idx['files'].items()}
+
+
+def pak_file(path: str, with_pcm=True,
+             swaps: Dict[str, Tuple[str, str]] = None
+             ) -> Tuple[str, dict, bytes, Optional[str], Optional[bytes]]:
+    """
+    (key, entry, data, palette hex, sound PCM) of `build_pak`. The `swaps`
+    have no data, their entry points to the 'base' one.
+    """
+    init_display()
+    pcm = None
+    if path.endswith(('.gif', '.png')):
+        swap = (swaps or {}).get(asset_key(path))
+        if swap:
+            base, rgb = swap
+            img = image.load(base)
+            img.set_palette(list(zip(*[iter(bytes.fromhex(rgb))] * 3)))
+        else:
+            img = image.load(path)
+        e, data, pal = pak_image(img)
+        if swap:
+            e['base'], data = asset_key(base), b''
+        if bounds := opaque_bounds(img):
+            e['b'] = bounds
+    else:
+        with open(path, 'rb') as f:
+            e, data, pal = {}, f.read(), None
+        if (with_pcm and path.endswith('.ogg')
+                and len(data) <= SND_STREAM_MIN and init_mixer()):
+            pcm = Sound(file=io.BytesIO(data)).get_raw()
+    e.update(source_stamp(path))
+    return asset_key(path), e, data, pal, pcm
+
+
+def bundle_of(key: str) -> str:
+    """
+    Web build bundle of the asset key, see `build_bundles`.
+    """
+    parts = key.split('/')
+    if len(parts) > 3 and parts[1] == 'spritesB' and parts[2] in BUNDLES:
+        return parts[2]
+    return 'core'
+
+
+def build_pak(path: str = PAK_PATH,
+              roots: Iterable[str] = (IMG_PATH, SND_PATH),
+              map_: Callable = map, force=False, bundle: str = None,
+              with_pcm=True) -> str:
+    """
+    Packs the image and sound trees, or the files of the `bundle`, into
+    one file, see `Pak`. Images are verified to load back pixel-exact,
+    sound PCM - sample-exact.
+    """
+    init_display()
+    files = sorted(f for root in roots for f in Path(root).rglob('*')
+                   if f.is_file()
+                   and bundle in (None, bundle_of(asset_key(str(f)))))
+    sources = sources_digest(files)
+    if pak and pak.path == path:
+        close_pak()
+    if old := Pak.load(path):
+        old.close()  # replaced below
+        if not force and old.sources == sources:
+            print(f'pak: {path} is up to date')
+            return path
+    index = {}
+    palettes = []
+    blobs = []
+    offset = 0
+    swaps = pak_swaps()
+    for key, e, data, pal, pcm in map_(partial(pak_file, with_pcm=with_pcm,
+                                               swaps=swaps),
+                                       map(str, files)):
+        if pal is not None:
+            if pal not in palettes:
+                palettes.append(pal)
+            e['p'] = palettes.index(pal)
+        index[key] = e
+        if 'base' not in e:
+            e.update(o=offset, n=len(data))
+            blobs.append((offset, data))
+            offset = Pak.align(offset + len(data))
+        if pcm is not None:
+            e['pcm'] = {'o': offset, 'n': len(pcm)}
+            blobs.append((offset, pcm))
+            offset = Pak.align(offset + len(pcm))
+    idx = {'sources': sources, 'files': index, 'palettes': palettes}
+    if any('pcm' in e for e in index.values()):
+        idx['mixer'] = MIXER
+    if bundle == 'core':
+        idx['bundles'] = BUNDLES
+    idx = json.dumps(idx, separators=(',', ':')).encode()
+    header = Pak.HEADER.pack(Pak.MAGIC, PAK_VERSION, len(idx))
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as out:
+        out.write(header + idx)
+        base = Pak.align(out.tell())
+        for offset, data in blobs:
+            out.seek(base + offset)
+            out.write(data)
+    os.replace(tmp, path)
+    packed = Pak.load(path)
+    if bundle not in (None, 'core'):  # the base poses are in the core pak
+        core = Pak.load(join(dirname(path), basename(PAK_PATH)))
+        core.mount(bundle, packed)
+        packed = core
+    try:
+        verify_pak(packed, files)
+    finally:
+        packed.close()
+    formats = Counter('swap' if 'base' in e else
+                      e.get('f', 'pcm' if 'pcm' in e else 'raw')
+                      for e in index.values())
+    print(f'pak: {path}, {len(index)} files, {len(palettes)} palettes,'
+          f' {os.path.getsize(path) // 1024} Kb, {dict(formats)}')
+    return path
+
+
+def verify_pak(packed: Pak, files: Iterable[Path]):
+    """
+    Images load back pixel-exact, sound PCM - sample-exact.
+    """
+    for f in files:
+        e = packed.index[asset_key(str(f))]
+        if f.suffix in ('.gif', '.png'):
+            img = packed.image(e).convert_alpha()  # no pak pixels left
+            if (image.tobytes(img, 'RGBA')
+                    != image.tobytes(image.load(f).convert_alpha(), 'RGBA')):
+                raise ValueError(f'pak image differs: {f}')
+        elif (pcm := e.get('pcm')) and init_mixer():
+            blob = packed.blob(pcm)
+            same = Sound(str(f)).get_raw() == blob
+            blob.release()
+            if not same:
+                raise ValueError(f'pak sound differs: {f}')
+
+
+def build_bundles(out_dir: str = BUNDLE_DIR, map_: Callable = map,
+                  force=False):
+    """
+    Web build paks: the core `assets.pak` of the menu, the first stages,
+    the sounds and the opponent palettes, and a pak per other opponent,
+    fetched while the game runs, see `fetch_bundle`. No sound PCM, it is
+    bigger to download than to decode the Ogg in the browser.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    for name in ('core', *BUNDLES):
+        pak_name = basename(PAK_PATH) if name == 'core' else f'{name}.pak'
+        build_pak(join(out_dir, pak_name), map_=map_, force=force,
+                  bundle=name, with_pcm=False)
+
+
+SPRITE_SETS = ('spritesA', *(f'spritesB/spritesB{i}' for i in range(8)))
+BUILD_STEPS = ('manifest', 'atlases', 'palettes', 'pak')
+
+
+def prerender(scale: Tuple[float, float], unit: str) -> int:
+    """
+    Renders the animation frames of the sprite set `unit`, or the common
+    ones and the menu and stage images, at the `scale` into the disk
+    cache of this machine. Already cached ones are loaded.
+    """
+    from barbariantuw import anims
+    from barbariantuw.core import get_img, load_frames
+    init_display()
+    Game.scx, Game.scy = scale
+    Game.chw, Game.chh = int(320 / 40 * Game.scx), int(200 / 25 * Game.scy)
+    if unit in SPRITE_SETS:
+        tables = [load_frames(factory, unit) for factory in (
+            anims.barb, anims.barb_rtl, anims.tete_decap)]
+        names = []
+    else:
+        tables = [load_frames(factory) for factory in (
+            anims.sang_decap, anims.teteombre_decap, anims.vie,
+            anims.serpent, anims.serpent_rtl, anims.gnome, anims.feu,
+            anims.sorcier)]
+        names = [f'{subdir}/{f.name}' for subdir in ('menu', 'stage')
+                 for f in atlas_files(Path(IMG_PATH, subdir))]
+    for name in names:
+        get_img(name)
+    return len(names) + sum(len(a.frames) for anims_ in tables
+                            for a in anims_.values())
+
+
+@contextmanager
+def pool_map(jobs: int, initializer: Callable = None
+             ) -> Iterator[Callable]:
+    """
+    `map` over `jobs` processes, started after the previous build step
+    to see its outputs.
+    """
+    if jobs < 2:
+        yield map
+        return
+    with ProcessPoolExecutor(jobs, initializer=initializer) as pool:
+        def map_(fn, *iterables):
+            items = list(zip(*iterables))
+            if not items:
+                return iter(())
+            return pool.map(fn, *zip(*items),
+                            chunksize=max(1, len(items) // (4 * jobs)))
+
+        yield map_
+
+
+def prerender_cache(scales: Iterable[Tuple[float, float]],
+                    jobs: int = None):
+    """
+    Fills the disk cache of this machine at the `scales` across a process
+    pool, see `prerender`. Not a build step: the cache is per user, see
+    the game `--prerender` option.
+    """
+    units = [(s, unit) for s in scales for unit in ('common', *SPRITE_SETS)]
+    t0 = time.perf_counter()
+    with pool_map(jobs or os.cpu_count() or 1) as map_:
+        for (s, unit), n in zip(units, map_(prerender, *zip(*units))):
+            print(f'prerender {s[0]:g}x{s[1]:g} {unit}: {n} images')
+    print(f'prerender: {time.perf_counter() - t0:.2f} s')
+
+
+def build(steps: Iterable[str] = BUILD_STEPS, jobs: int = None,
+          force=False):
+    """
+    Runs the build steps across a process pool. The manifest hashes the
+    sources, the other steps skip the outputs built from the same ones,
+    see `sources_digest`, unless `force`. 'bundles' packs the web build,
+    see `build_bundles`.
+    """
+    global manifest, pak
+    jobs = jobs or os.cpu_count() or 1
+    close_pak()  # the pak step replaces it
+    for step in steps:
+        t0 = time.perf_counter()
+        with pool_map(jobs, close_pak) as map_:
+            if step == 'manifest':
+                build_manifest(map_=map_)
+                manifest = Manifest.load()
+            elif step == 'atlases':
+                build_atlases(map_=map_, force=force)
+            elif step == 'palettes':
+                build_palettes(map_=map_, force=force)
+            elif step == 'pak':
+                build_pak(map_=map_, force=force)
+                pak = Pak.load()
+            elif step == 'bundles':
+                build_bundles(map_=map_, force=force)
+            else:
+                raise ValueError(f'unknown build step: {step}')
+        print(f'{step}: {time.perf_counter() - t0:.2f} s')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m barbariantuw.assets',
+        description='Builds the packaged assets from the changed sources.')
+    parser.add_argument(
+        'steps', nargs='*', metavar='step',
+        help=f'{", ".join(BUILD_STEPS)}, bundles (web build paks in'
+             f' build/bundles). Default: all but bundles')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='worker processes, default: all cores')
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild the up to date outputs too')
+    args = parser.parse_args()
+    steps = args.steps or BUILD_STEPS
+    if unknown := set(steps) - {*BUILD_STEPS, 'bundles'}:
+        parser.error(f'unknown steps: {", ".join(sorted(unknown))}')
+    build(steps, args.jobs, args.force)
+
+
+if __name__ == '__main__':
+    # as barbariantuw.assets, the module of the core and the pool workers
+    from barbariantuw.assets import main as _main
+    _main()
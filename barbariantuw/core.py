@@ -1,27 +1,269 @@
-from dataclasses import dataclass, field
-from os.path import join
-from typing import Dict, Callable, TypedDict, Tuple, List, Optional, Iterator
-
-from pygame import Surface, image, Rect, Font
+import hashlib
+import os
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from os.path import join, dirname
+from types import MappingProxyType
+from typing import (
+    Dict, Callable, TypedDict, Tuple, List, Optional, Iterator, NamedTuple, Set,
+    Sequence, Mapping, Union
+)
+
+from pygame import Surface, Rect, Font, SRCALPHA, image, mixer
 from pygame.mixer import Sound  # import pygame.Sound breaks WASM!!!
 from pygame.sprite import Group, AbstractGroup, DirtySprite
 from pygame.transform import scale, rotate, flip
 
-from barbariantuw import IMG_PATH, Game, SND_PATH, OPTS, FONT, Theme
+from barbariantuw import Game, SND_PATH, OPTS, FONT, Theme
+from barbariantuw.assets import (
+    disk_cache, load_img, scaled_img, img_size, img_bounds, blit_format,
+    release_atlas, open_snd, Stream
+)
 
-img_cache: Dict[int, Surface] = {}
-snd_cache: Dict[int, Sound] = {}
 
+class ImgKey(NamedTuple):
+    name: str
+    w: float = 0
+    h: float = 0
+    angle: float = 0
+    xflip: bool = False
+    fill: Optional[Tuple[int, int, int]] = None
+    blend_flags: int = 0
+    color: Optional[Tuple[int, int, int]] = None
+    trim: bool = False  # see `trim_rect`
+    scale: Tuple[float, float] = None  # (scx, scy) of the pixels
 
-def get_img(name, w: float = 0, h: float = 0, angle: float = 0, xflip=False,
-            fill=None, blend_flags=0, color=None) -> Surface:
-    key_ = sum((hash(name), hash(w), hash(h), hash(angle), hash(xflip),
-                hash(fill), hash(blend_flags), hash(color)))
 
-    if key_ in img_cache:
-        return img_cache[key_]
+class ImgCache:
+    """
+    LRU cache of the scaled images with the memory `budget` (bytes, 0 - unlimited).
+    Pinned images (current battle frames) are never evicted.
+    Images with equal pixels are interned to one Surface, `size` counts it once.
+    A subsurface is charged as its parent, once for all the subsurfaces of
+    it, see `Atlas.scaled`: the pixels are freed with the last of them.
+    Thread-safe, the preloader fills it from the worker threads.
+    """
 
-    img: Surface
+    def __init__(self, budget: int = 0):
+        self.budget = budget
+        self.size = 0  # bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0  # bytes
+        self.dups = 0  # interned images
+        self.deduped = 0  # bytes
+        self._items: OrderedDict[ImgKey, Surface] = OrderedDict()
+        self._pinned: Set[ImgKey] = set()
+        self._interned: Dict[bytes, Surface] = {}  # digest: image
+        self._refs: Dict[int, Tuple[int, bytes]] = {}  # id: (keys, digest)
+        self._parents: Dict[int, int] = {}  # id: interned subsurfaces
+        self._local = threading.local()  # pinning is per thread
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key: ImgKey):
+        return key in self._items
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def _pinning(self) -> int:
+        return getattr(self._local, 'pinning', 0)
+
+    @staticmethod
+    def sizeof(img: Surface) -> int:
+        return img.get_width() * img.get_height() * img.get_bytesize()
+
+    def _charge(self, img: Surface, n: int) -> int:
+        """
+        Bytes taken (`n` 1) or freed (-1) by interning the image or
+        dropping it: its own, or the parent ones for the first or the last
+        subsurface.
+        """
+        parent = img
+        while (up := parent.get_parent()) is not None:
+            parent = up
+        if parent is img:
+            return self.sizeof(img)
+        refs = self._parents.pop(id(parent), 0)
+        if refs + n:
+            self._parents[id(parent)] = refs + n
+        return self.sizeof(parent) if refs == (n < 0) else 0  # 1st, last
+
+    @staticmethod
+    def digest(img: Surface) -> bytes:
+        # equal pixels of the different formats blend differently
+        key = img.get_colorkey()
+        h = hashlib.sha1(struct.pack('<7I', *img.get_size(),
+                                     img.get_flags() & 0xFFFFFFFF,
+                                     img.get_bitsize(), *img.get_masks()[:2],
+                                     img.map_rgb(key) if key else 0xFFFFFFFF))
+        if (img.get_parent() is None
+                and img.get_pitch() == img.get_width() * img.get_bytesize()):
+            h.update(img.get_buffer())  # no copy
+        else:
+            h.update(image.tobytes(img, 'RGBA'))
+        return h.digest()
+
+    def get(self, key: ImgKey) -> Optional[Surface]:
+        with self._lock:
+            img = self._items.get(key)
+            if img is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._items.move_to_end(key)
+            if self._pinning:
+                self._pinned.add(key)
+            return img
+
+    def put(self, key: ImgKey, img: Surface) -> Surface:
+        """
+        Returns the interned image, use it instead of `img`.
+        """
+        digest = self.digest(img)
+        with self._lock:
+            if key in self._items:
+                self._drop(key)
+            if (same := self._interned.get(digest)) is not None:
+                img = same
+                self.dups += 1
+                self.deduped += self.sizeof(img)
+            refs, _ = self._refs.get(id(img), (0, digest))
+            if not refs:
+                self._interned[digest] = img
+                self.size += self._charge(img, 1)
+            self._refs[id(img)] = (refs + 1, digest)
+            self._items[key] = img
+            if self._pinning:
+                self._pinned.add(key)
+            self._evict()
+            return img
+
+    def _drop(self, key: ImgKey) -> int:
+        img = self._items.pop(key)
+        self._pinned.discard(key)
+        refs, digest = self._refs.pop(id(img))
+        if refs > 1:
+            self._refs[id(img)] = (refs - 1, digest)
+            return 0
+        del self._interned[digest]
+        sz = self._charge(img, -1)
+        self.size -= sz
+        return sz
+
+    def _evict(self):
+        if not self.budget or self.size <= self.budget:
+            return
+        for key in list(self._items):
+            if self.size <= self.budget:
+                break
+            if key not in self._pinned:
+                self.evicted += self._drop(key)
+
+    @contextmanager
+    def pinning(self):
+        """
+        Pins every image requested inside the block by the current thread.
+        """
+        self._local.pinning = self._pinning + 1
+        try:
+            yield self
+        finally:
+            self._local.pinning -= 1
+
+    def unpin(self):
+        with self._lock:
+            self._pinned.clear()
+            self._evict()
+
+    def release(self, scope: str, keep: str = None) -> Set[str]:
+        """
+        Drops the images of the `scope` (see `img_scope`), pinned ones too,
+        except the `keep` tag. Returns the dropped tags.
+        """
+        tags = set()
+        with self._lock:
+            for key in list(self._items):
+                key_scope, tag = img_scope(key.name)
+                if key_scope == scope and tag != keep:
+                    self._drop(key)
+                    tags.add(tag)
+        return tags
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._pinned.clear()
+            self._interned.clear()
+            self._refs.clear()
+            self._parents.clear()
+            self.size = 0
+
+
+DECORS = ('foret', 'plaine', 'trone', 'arene')
+
+
+def img_scope(name: str) -> Tuple[str, str]:
+    """
+    Lifetime of the image as (scope, tag):
+    'opponent' - `spritesB/spritesB{ia}` set, 'stage' - `Game.decor`
+    background, 'menu' - menu screens, 'global' - everything else.
+    """
+    if name.startswith('spritesB/'):
+        return 'opponent', dirname(name)
+    if name.startswith('stage/'):
+        for decor in DECORS:
+            if name.startswith(decor, 6):
+                return 'stage', decor
+    elif name.startswith('menu/'):
+        return 'menu', 'menu'
+    return 'global', ''
+
+
+img_cache = ImgCache()
+snd_cache: Dict[str, Union[Sound, Stream]] = {}
+
+
+def get_img(name, w: float = 0, h: float = 0, angle: float = 0, xflip=False,
+            fill=None, blend_flags=0, color=None, trim=False,
+            scale=None) -> Surface:
+    """
+    The image at the `scale` (scx, scy), the current one by default. The
+    preloader threads render at the scale their job started with.
+    """
+    key_ = ImgKey(name, w, h, angle, xflip, fill, blend_flags, color, trim,
+                  scale or (Game.scx, Game.scy))
+    img = img_cache.get(key_)
+    if img is not None:
+        return img
+
+    if not any(key_[1:-2]):  # untransformed, may share the scaled atlas
+        img = scaled_img(name, key_.scale)
+        if img is not None and (r := trim_rect(key_)):
+            img = img.subsurface(r)
+    if img is None:
+        img = disk_cache.load(key_)
+    if img is None:
+        img = _render_img(key_)
+        disk_cache.save(key_, img)
+    return img_cache.put(key_, blit_format(img))
+
+
+def _render_img(key_: ImgKey) -> Surface:
+    name, w, h, angle, xflip, fill, blend_flags, color, trim, sc = key_
+    scx, scy = sc
     if name == 'empty':
         img = Surface((0, 0))
     elif name == 'fill':
@@ -29,38 +271,63 @@ def get_img(name, w: float = 0, h: float = 0, angle: float = 0, xflip=False,
         if fill:
             img = img.copy()
             img.fill(fill)
-    elif color:
-        img = image.load(join(IMG_PATH, name))
-        img.set_colorkey(color)
-        img = img.convert_alpha()
     else:
-        img = image.load(join(IMG_PATH, name)).convert_alpha()
+        img = load_img(name, color)
+        if img.get_bitsize() == 8 and (angle or blend_flags):
+            img = img.convert_alpha()  # the palette swap, scaled only
     #
     if fill and blend_flags:
         img = img.copy()
         img.fill(fill, special_flags=blend_flags)
     if w > 0 or h > 0:
-        img = scale(img, (round(w * Game.scx), round(h * Game.scy)))
+        img = scale(img, (round(w * scx), round(h * scy)))
     else:
-        img = scale(img, (round(img.get_width() * Game.scx),
-                          round(img.get_height() * Game.scy)))
+        img = scale(img, (round(img.get_width() * scx),
+                          round(img.get_height() * scy)))
     if angle != 0:
         img = rotate(img, angle)
     if xflip:
         img = flip(img, xflip, False)
-    img_cache[key_] = img
+    if trim and (r := trim_rect(key_)):
+        img = img.subsurface(r).copy()
     return img
 
 
-def get_snd(name: str) -> Sound:
-    key_ = hash(name)
+def trim_rect(key_: ImgKey) -> Optional[Rect]:
+    """
+    Opaque part of the scaled unrotated image by `img_bounds`,
+    None - nothing to trim. Nearest-neighbour scaling maps the bounds
+    to floor/ceil of the scaled ones, the trimmed pixels stay the same.
+    """
+    if (not key_.trim or key_.angle or key_.fill or key_.blend_flags
+            or key_.color or not (bounds := img_bounds(key_.name))):
+        return None
+    x, y, w, h = bounds
+    src_w, src_h = img_size(key_.name)
+    dst_w, dst_h = scaled_size(key_)
+    left, right = x * dst_w // src_w, -(-(x + w) * dst_w // src_w)
+    top, bottom = y * dst_h // src_h, -(-(y + h) * dst_h // src_h)
+    if key_.xflip:
+        left, right = dst_w - right, dst_w - left
+    return Rect(left, top, right - left, bottom - top)
+
+
+def get_snd(name: str) -> Union[Sound, Stream]:
+    if name in snd_cache:
+        return snd_cache[name]
+
+    snd = open_snd(join(SND_PATH, name))
+    snd_cache[name] = snd
+    return snd
 
-    if key_ in snd_cache:
-        return snd_cache[key_]
 
-    snd = Sound(join(SND_PATH, name))
-    snd_cache[key_] = snd
-    return snd
+def snd_sizes() -> Dict[str, int]:
+    """
+    {name: resident bytes} of the loaded sounds, the PCM of the decoded
+    ones, 0 - streamed.
+    """
+    return {name: 0 if isinstance(snd, Stream) else memoryview(snd).nbytes
+            for name, snd in snd_cache.items()}
 
 
 def snd_play(name: str):
@@ -73,14 +340,119 @@ def snd_stop(name: str):
         get_snd(name).stop()
 
 
+def snd_stop_all():
+    mixer.stop()
+    if Stream.playing:
+        Stream.playing.stop()
+
+
+class Preloader:
+    """
+    Runs the asset jobs (`get_img`, `get_snd`, animation factories) on a thread
+    pool, the images land in the `img_cache`. WASM has no threads, the jobs
+    run one by `poll` on the main thread.
+    `live` - the preloaders with jobs left or running, see `cancel_all`,
+    held until their last job is done, even if dropped by their owner.
+    """
+    live: Set['Preloader'] = set()
+    _live_lock = threading.Lock()  # the done callbacks run on the pool
+
+    def __init__(self, jobs: List[Callable[[], object]], workers: int = 0):
+        self.total = len(jobs)
+        self._jobs = list(jobs)
+        self._futures: List[Future] = []
+        self._inline = 0
+        with Preloader._live_lock:
+            Preloader.live.add(self)
+        if sys.platform != 'emscripten':
+            workers = workers or min(4, os.cpu_count() or 1)
+            executor = ThreadPoolExecutor(workers,
+                                          thread_name_prefix='preload')
+            self._futures = [executor.submit(self._run, job)
+                             for job in self._jobs]
+            self._jobs.clear()
+            executor.shutdown(wait=False)
+            for f in self._futures:
+                f.add_done_callback(self._settle)
+        self._settle()
+
+    def _settle(self, _: Future = None):
+        if not self._jobs and all(f.done() for f in self._futures):
+            with Preloader._live_lock:
+                Preloader.live.discard(self)
+
+    @staticmethod
+    def _run(job: Callable[[], object]):
+        try:
+            job()
+        except Exception as ex:
+            print(f'preload error: {ex}')
+
+    @property
+    def done(self) -> int:
+        return self._inline + sum(1 for f in self._futures if f.done())
+
+    @property
+    def finished(self) -> bool:
+        return self.done == self.total
+
+    def poll(self) -> bool:
+        if self._jobs:
+            self._run(self._jobs.pop(0))
+            self._inline += 1
+            self._settle()
+        return self.finished
+
+    def cancel(self, block: bool = False):
+        """
+        Drops the jobs not started yet, `block` - waits for the running ones.
+        """
+        for f in self._futures:
+            f.cancel()
+        self._jobs.clear()
+        self._settle()
+        if block:
+            wait(self._futures)
+
+    @staticmethod
+    def cancel_all():
+        """
+        Cancels every live preloader and waits for the running jobs, before
+        the scale change: they would fill the caches at the old scale.
+        """
+        with Preloader._live_lock:
+            live = list(Preloader.live)
+        for preloader in live:
+            preloader.cancel(block=True)
+
+
+def release_assets(scope: str, keep: str = None):
+    """
+    Frees the images of the left `scope`, the opponent atlases and animation
+    tables too.
+    """
+    for tag in img_cache.release(scope, keep):
+        release_atlas(tag)
+        release_tables(tag)
+
+
 Action = Callable[['AnimatedSprite'], None]
 Action2 = Callable[['AnimatedSprite', TypedDict], None]
 
 
-@dataclass(slots=True, frozen=True)
-class Frame:
+class Frame(NamedTuple):
     """
     `tick` end tick. A next tick will apply a next frame.
+    `image` is looked up in the `img_cache` on every access, so the cache
+    budget and pinning apply, loaded if missing. `w` and `h` are known
+    before.
+    `x`, `y`, `w`, `h` are of the trimmed image, `pad` (left, top, right,
+    bottom) - the trimmed transparent margins, see `trim_rect`. `dx` - the
+    unrounded `x` of the untrimmed image, see `mirror`.
+    Immutable and hashable, shared by the `anim_table` users. A tuple, not
+    a frozen dataclass: its `__init__` sets every field through
+    `object.__setattr__`, 5x slower. `key`, `pad` and `dx` are left out of
+    the comparison.
     """
     name: str
     x: float = 0
@@ -89,7 +461,26 @@ class Frame:
     h: float = 0
     mv: Tuple[float, float] = None
     tick: int = 1
-    image: Surface = field(compare=False, default=None)
+    key: ImgKey = None
+    pad: Tuple[int, int, int, int] = (0, 0, 0, 0)
+    dx: float = 0
+
+    def __eq__(self, other):
+        if not isinstance(other, Frame):
+            return NotImplemented
+        return self[:7] == other[:7]
+
+    def __ne__(self, other):
+        if not isinstance(other, Frame):
+            return NotImplemented
+        return self[:7] != other[:7]
+
+    def __hash__(self):
+        return hash(self[:7])
+
+    @property
+    def image(self) -> Surface:
+        return get_img(*self.key)
 
 
 def frame(name: str, *,
@@ -98,9 +489,75 @@ def frame(name: str, *,
           fill: Tuple[int, int, int] = None, blend_flags: int = 0,
           mv: Tuple[float, float] = None, tick: int = 1,
           colorkey: Tuple[int, int, int] = None):
-    img = get_img(name, w, h, angle, xflip, fill, blend_flags, colorkey)
-    rect = img.get_rect()
-    return Frame(name, round(dx), round(dy), rect.w, rect.h, mv, tick, img)
+    key_ = ImgKey(name, w, h, angle, xflip, fill, blend_flags, colorkey,
+                  trim=True, scale=(Game.scx, Game.scy))
+    return trimmed(name, dx, round(dy), mv, tick, key_)
+
+
+def trimmed(name: str, dx: float, y: int, mv: Optional[Tuple[float, float]],
+            tick: int, key_: ImgKey) -> 'Frame':
+    """
+    Lazy frame of the untrimmed image at (round(dx), y) with its
+    transparent margins folded into the position.
+    """
+    x = round(dx)
+    if key_.angle:  # the rotated size is known after the rotation only
+        img = get_img(*key_)
+        return Frame(name, x, y, *img.get_size(), mv, tick, key_, dx=dx)
+    w, h = scaled_size(key_)
+    if r := trim_rect(key_):
+        pad = (r.x, r.y, w - r.right, h - r.bottom)
+        return Frame(name, x + r.x, y + r.y, r.w, r.h, mv, tick, key_, pad,
+                     dx)
+    return Frame(name, x, y, w, h, mv, tick, key_, dx=dx)
+
+
+def mirror(anims: Mapping[str, 'Animation'], width: float,
+           fixes: Dict[str, Dict[int, dict]] = None) -> Dict[str, 'Animation']:
+    """
+    Right-to-left animations from the left-to-right ones: toggled `xflip`,
+    frames mirrored in the `width` box, mirrored moves. The images are not
+    loaded until shown. `fixes` {anim: {frame index: dict(dx, xflip, mv)}}
+    overrides the hand-tuned frames. Mirrored from the unrounded offsets
+    and sizes, rounded once, as the frames written right-to-left.
+    """
+    fixes = fixes or {}
+    mirrored = {}
+    for name, anim in anims.items():
+        fix = fixes.get(name, {})
+        frames = []
+        for i, f in enumerate(anim.frames):
+            kw = fix.get(i, {})
+            top = f.pad[1]
+            w = unscaled_size(f.key)[0] * f.key.scale[0]
+            dx = kw['dx'] if 'dx' in kw else width - f.dx - w
+            mv = kw['mv'] if 'mv' in kw else f.mv and (-f.mv[0], f.mv[1])
+            key_ = f.key._replace(xflip=kw.get('xflip', not f.key.xflip))
+            frames.append(trimmed(f.name, dx, f.y - top, mv, f.tick, key_))
+        mirrored[name] = Animation(frames, anim.actions)
+    return mirrored
+
+
+def unscaled_size(key_: ImgKey) -> Tuple[float, float]:
+    """
+    Size of the unrotated `get_img` image at 1x, without loading it.
+    """
+    if key_.w > 0 or key_.h > 0:
+        return key_.w, key_.h
+    if key_.name == 'empty':
+        return 0, 0
+    if key_.name == 'fill':
+        return 1, 1
+    return img_size(key_.name)
+
+
+def scaled_size(key_: ImgKey) -> Tuple[int, int]:
+    """
+    Size of the unrotated `get_img` image without loading it.
+    """
+    w, h = unscaled_size(key_)
+    scx, scy = key_.scale
+    return round(w * scx), round(h * scy)
 
 
 class Act:
@@ -114,8 +571,50 @@ class Act:
 
 @dataclass(slots=True, frozen=True)
 class Animation:
-    frames: List[Frame]
-    actions: List[Act] = None
+    frames: Sequence[Frame]
+    actions: Sequence[Act] = None
+
+
+AnimTable = Mapping[str, Animation]
+anim_tables: Dict[tuple, AnimTable] = {}
+
+
+def anim_table(factory: Callable[..., Dict[str, Animation]]):
+    """
+    Builds the animation table once per (factory, subdir, scale), the sprites
+    and battles share it read-only. `anim_tables.clear()` on the scale change
+    and the viewer reload.
+    """
+
+    @wraps(factory)
+    def table(*args) -> AnimTable:
+        key_ = (factory.__name__, *args, Game.scx, Game.scy)
+        if (anims := anim_tables.get(key_)) is None:
+            anims = MappingProxyType({
+                name: Animation(tuple(a.frames),
+                                tuple(a.actions) if a.actions else None)
+                for name, a in factory(*args).items()})
+            # the preloader threads may race, keep the first one
+            anims = anim_tables.setdefault(key_, anims)
+        return anims
+
+    return table
+
+
+def load_frames(factory: Callable[..., AnimTable], *args) -> AnimTable:
+    """
+    Animation table with all frame images loaded, for the preloader.
+    """
+    anims = factory(*args)
+    for anim in anims.values():
+        for f in anim.frames:
+            _ = f.image
+    return anims
+
+
+def release_tables(subdir: str):
+    for key_ in [k for k in anim_tables if subdir in k[1:-2]]:
+        anim_tables.pop(key_, None)
 
 
 class Actions:
@@ -269,16 +768,64 @@ class Txt(DirtySprite):
         return img, rect
 
 
+class Counter(DirtySprite):
+    """
+    Zero padded number composed of the cached `Txt` glyphs of its digits,
+    no font rendering when it changes. The font is monospaced.
+    """
+
+    def __init__(self,
+                 size: int,
+                 value: int,
+                 digits: int,
+                 color: Tuple[int, int, int],
+                 pos: Tuple[int, int] = (0, 0),
+                 *groups,
+                 fnt: str = FONT):
+        super().__init__(*groups)
+        self.glyphs = [Txt(size, str(d), color, fnt=fnt).image
+                       for d in range(10)]
+        self._digits = digits
+        self._value = None
+        self.image = Surface((0, 0))
+        self.rect = Rect(pos, (0, 0))
+        self.value = value
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    @value.setter
+    def value(self, value: int):
+        if self._value == value:
+            return
+        self._value = value
+        msg = f'{value:0{self._digits}}'
+        w, h = self.glyphs[0].get_size()
+        if self.image.get_width() != w * len(msg):
+            self.image = Surface((w * len(msg), h), SRCALPHA)
+            self.rect.size = self.image.get_size()
+        else:
+            self.image.fill((0, 0, 0, 0))
+        self.image.blits([(self.glyphs[int(d)], (i * w, 0))
+                          for i, d in enumerate(msg)])
+        self.dirty = 1
+
+
 class StaticSprite(DirtySprite):
     def __init__(self,
                  pos: Tuple[int, int],
-                 img: str,
+                 img: Union[str, Surface],
                  /,
                  *groups: AbstractGroup,
                  w=0, h=0, xflip: bool = False, fill=None,
                  color: Tuple[int, int, int] = None):
         super().__init__(*groups)
-        self.image = get_img(img, w=w, h=h, xflip=xflip, fill=fill, color=color)
+        if isinstance(img, Surface):  # composed, see `stage_front`
+            self.image = img
+        else:
+            self.image = get_img(img, w=w, h=h, xflip=xflip, fill=fill,
+                                 color=color)
         self.rect = self.image.get_rect()
         self.rect.move_ip(pos[0], pos[1])
 
@@ -290,7 +837,7 @@ class AnimatedSprite(DirtySprite):
 
     def __init__(self,
                  topleft: Tuple[float, float],
-                 animations: Dict[str, Animation],
+                 animations: AnimTable,
                  *groups):
         super().__init__(*groups)
         self.anims = animations
@@ -363,6 +910,15 @@ class AnimatedSprite(DirtySprite):
             self._topleft = topleft
             self._update_rect()
 
+    @property
+    def box(self) -> Rect:
+        """
+        `rect` of the untrimmed frame, see `Frame.pad`.
+        """
+        left, top, right, bottom = self.frame.pad
+        return Rect(self.rect.x - left, self.rect.y - top,
+                    self.rect.w + left + right, self.rect.h + top + bottom)
+
     @property
     def speed(self) -> float:
         return self._speed
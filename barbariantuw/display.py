@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+Display backends: the surface the scenes draw on and how its dirty rects
+reach the window, or the textures a scene is composited from, see the
+`--renderer` option.
+"""
+from functools import lru_cache
+from math import gcd
+from typing import List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+import pygame as pg
+from pygame import Rect, Surface
+
+from barbariantuw import Theme
+
+RENDERERS = ('surface', 'gpu', 'software')
+STRIPS = 10  # background textures of a composited scene, see `composite`
+
+
+@lru_cache
+def scale_block(src: int, dst: int, vertical: bool) -> int:
+    """
+    Pixels of the runs of a `src` line scaled alone to the same pixels as
+    in the whole line scaled to `dst`, `src` - only the whole line does.
+    The smallest runs scaling to whole pixels, if `transform.scale` keeps
+    its nearest-neighbour steps across them, checked on a probe line.
+    """
+    n = src // gcd(src, dst)
+    if n == src:
+        return src
+
+    def rect(start: int, length: int) -> Rect:
+        if vertical:
+            return Rect(0, start, 1, length)
+        return Rect(start, 0, length, 1)
+
+    line = Surface(rect(0, src).size, 0, 32)
+    for i in range(src):
+        line.fill((i & 255, i >> 8, 0), rect(i, 1))
+    whole = pg.transform.scale(line, rect(0, dst).size)
+    for i in range(0, src, n):
+        part = rect(i * dst // src, (i + n) * dst // src - i * dst // src)
+        run = pg.transform.scale(line.subsurface(rect(i, n)), part.size)
+        if (pg.image.tobytes(run, 'RGB')
+                != pg.image.tobytes(whole.subsurface(part), 'RGB')):
+            return src
+    return n
+
+
+class Display(object):
+    """
+    Window surface backend. The scenes draw on the window surface, or on
+    the `native` back buffer upscaled once into it, see `present`.
+    """
+
+    def __init__(self, size: Tuple[int, int],
+                 buffer: Optional[Tuple[int, int]] = None):
+        self.window = pg.display.set_mode(size)
+        self.buffered = buffer is not None
+        self.screen = Surface(buffer) if buffer else self.window
+        self.view = self.viewport()
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.window.get_size()
+
+    def render(self, scene):
+        """
+        Draws the `scene` on the `screen`, then presents its dirty rects.
+        """
+        self.present(scene.draw(self.screen))
+
+    @property
+    def fullscreen(self) -> bool:
+        return pg.display.is_fullscreen()
+
+    def set_caption(self, title: str, icon: Optional[Surface] = None):
+        pg.display.set_caption(title, 'BARBARIAN')
+        if icon:
+            pg.display.set_icon(icon)
+
+    def set_mode(self, size: Tuple[int, int], fullscreen: bool,
+                 buffer: Tuple[int, int]):
+        """
+        Window or desktop fullscreen of `size`, the scenes then draw at
+        `buffer` size, unchanged if buffered.
+        """
+        if fullscreen:
+            pg.display.set_mode(size)
+            pg.display.toggle_fullscreen()
+        else:
+            pg.display.toggle_fullscreen()
+            pg.display.set_mode(size)
+        self.window = pg.display.get_surface()
+        self.resize(buffer)
+
+    def resize(self, buffer: Tuple[int, int]):
+        if not self.buffered:
+            self.screen = self.window
+        elif self.screen.get_size() != buffer:
+            self.screen = Surface(buffer)
+        self.view = self.viewport()
+        if self.buffered:
+            self.window.fill(Theme.BACK)
+            self.present([self.screen.get_rect()])
+
+    def viewport(self) -> Rect:
+        """
+        Window area of the back buffer: the biggest integer scale
+        centered, letterboxed. Fitted, if the window is smaller.
+        """
+        (w, h), (ww, wh) = self.screen.get_size(), self.size
+        n = min(ww // w, wh // h)
+        if not n:
+            n = min(ww / w, wh / h)
+        view = Rect(0, 0, int(w * n), int(h * n))
+        view.center = (ww // 2, wh // 2)
+        return view
+
+    def fitted(self, r: Rect) -> Tuple[Rect, Rect]:
+        """
+        (back buffer, window) rects of the fractional scale covering `r`,
+        aligned to the runs of pixels scaled alone as in the whole frame,
+        see `scale_block`.
+        """
+        view, (w, h) = self.view, self.screen.get_size()
+        bw = scale_block(w, view.w, False)
+        bh = scale_block(h, view.h, True)
+        left, top = r.x // bw * bw, r.y // bh * bh
+        right = min(w, -(-r.right // bw) * bw)
+        bottom = min(h, -(-r.bottom // bh) * bh)
+        x0, y0 = left * view.w // w, top * view.h // h
+        return (Rect(left, top, right - left, bottom - top),
+                Rect(view.x + x0, view.y + y0,
+                     right * view.w // w - x0, bottom * view.h // h - y0))
+
+    def present(self, dirty: List[Rect]):
+        """
+        Updates the window with the dirty rects, upscaled once from the
+        native back buffer, nearest-neighbour.
+        """
+        if self.screen is self.window:
+            pg.display.update(dirty)
+            return
+        if not dirty:
+            return
+        view, buffer = self.view, self.screen
+        n, frac = divmod(view.w, buffer.get_width())
+        if frac:
+            area = buffer.get_rect().clip(Rect(dirty[0]).unionall(dirty[1:]))
+            if area:
+                src, dst = self.fitted(area)
+                pg.transform.scale(buffer.subsurface(src), dst.size,
+                                   self.window.subsurface(dst))
+                pg.display.update(dst)
+            return
+        updated = []
+        for r in dirty:
+            r = buffer.get_rect().clip(r)
+            if r:
+                dst = Rect(view.x + r.x * n, view.y + r.y * n,
+                           r.w * n, r.h * n)
+                pg.transform.scale(buffer.subsurface(r), dst.size,
+                                   self.window.subsurface(dst))
+                updated.append(dst)
+        pg.display.update(updated)
+
+
+class RendererDisplay(Display):
+    """
+    SDL2 Renderer backend. The scenes draw on a back buffer, uploaded to
+    a streaming texture, then the renderer scales the frame into the
+    window: on the GPU if `accelerated`, else with the SDL software
+    renderer. On the GPU, a scene with a `composite` method, the battle,
+    is drawn from textures instead, see `composite`: the software
+    renderer scales the textures slower than it copies the frame.
+    The display module only keeps a hidden 1x1 window for the pixel
+    format of `convert`.
+    """
+
+    def __init__(self, size: Tuple[int, int], buffer: Tuple[int, int],
+                 accelerated: bool):
+        # noinspection PyProtectedMember
+        from pygame._sdl2 import video
+        self.video = video
+        pg.display.set_mode((1, 1), pg.HIDDEN)
+        self.window = video.Window('BARBARIAN', size)
+        self.renderer = None
+        if accelerated:
+            try:
+                self.renderer = video.Renderer(self.window, accelerated=1,
+                                               vsync=False)
+            except RuntimeError as ex:  # not a pygame.error
+                print(f'gpu renderer error: {ex}, software fallback')
+        self.accelerated = self.renderer is not None
+        self.composited = self.accelerated
+        if not self.renderer:
+            self.renderer = video.Renderer(self.window, accelerated=0,
+                                           vsync=False)
+        self.renderer.draw_color = Theme.BACK
+        self._fullscreen = False
+        self.buffered = True
+        self.screen = Surface(buffer).convert()
+        self.texture = self.stream()
+        self.view = self.viewport()
+        self.back: Optional[Surface] = None
+        self.strips: List[Tuple[Rect, object]] = []
+        self.textures: 'WeakKeyDictionary[Surface, object]' = \
+            WeakKeyDictionary()
+
+    def stream(self):
+        return self.video.Texture(self.renderer, self.screen.get_size(),
+                                  streaming=True)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.window.size
+
+    @property
+    def fullscreen(self) -> bool:
+        return self._fullscreen
+
+    def set_caption(self, title: str, icon: Optional[Surface] = None):
+        self.window.title = title
+        if icon:
+            self.window.set_icon(icon)
+
+    def set_mode(self, size: Tuple[int, int], fullscreen: bool,
+                 buffer: Tuple[int, int]):
+        if fullscreen:
+            self.window.set_fullscreen(desktop=True)
+        else:
+            self.window.set_windowed()
+            self.window.size = size
+        self._fullscreen = fullscreen
+        self.resize(buffer)
+
+    def resize(self, buffer: Tuple[int, int]):
+        if self.screen.get_size() != buffer:
+            self.screen = Surface(buffer).convert()
+            self.texture = self.stream()
+        self.view = self.viewport()
+        self.present([self.screen.get_rect()])
+
+    def present(self, dirty: List[Rect]):
+        """
+        Uploads the frame if dirty, then redraws it whole: the window
+        content is undefined after a renderer present.
+        `Texture.update` ignores its area, so no per dirty rect upload.
+        """
+        if dirty:
+            self.texture.update(self.screen)
+            self.renderer.clear()
+            self.texture.draw(dstrect=self.view)
+            self.renderer.present()
+
+    def render(self, scene):
+        composite = getattr(scene, 'composite', None)
+        if composite and self.composited:
+            self.composite(*composite())
+            return
+        if self.back:
+            self.back = None
+            self.strips.clear()
+            self.textures.clear()
+        super().render(scene)
+
+    def to_view(self, r: Rect) -> Rect:
+        """
+        Window rect of the back buffer rect `r`, see `viewport`.
+        """
+        (w, h), view = self.screen.get_size(), self.view
+        left, top = r.x * view.w // w, r.y * view.h // h
+        return Rect(view.x + left, view.y + top,
+                    r.right * view.w // w - left,
+                    r.bottom * view.h // h - top)
+
+    def composite(self, back: Surface, area: Optional[Rect],
+                  sprites: List[Tuple[Surface, Rect]]):
+        """
+        Draws a scene from textures: the `back`ground in horizontal
+        strips, the ones across its changed `area` uploaded again, then
+        the `sprites` images in order, a texture per image. The images
+        are not redrawn in place, a new one gets its own texture.
+        The renderer scales them into the window, no frame upload.
+        """
+        renderer, video = self.renderer, self.video
+        if back is not self.back:
+            self.back = back
+            w, h = back.get_size()
+            edges = [h * i // STRIPS for i in range(STRIPS + 1)]
+            self.strips = []
+            for top, bottom in zip(edges, edges[1:]):
+                r = Rect(0, top, w, bottom - top)
+                self.strips.append((r, video.Texture.from_surface(
+                    renderer, back.subsurface(r))))
+        elif area:
+            for r, texture in self.strips:
+                if r.colliderect(area):
+                    texture.update(back.subsurface(r))
+        renderer.clear()
+        for r, texture in self.strips:
+            texture.draw(dstrect=self.to_view(r))
+        bounds = back.get_rect()
+        textures = self.textures
+        for img, r in sprites:
+            r = Rect(r.topleft, img.get_size())
+            if clip := r.clip(bounds):
+                if (texture := textures.get(img)) is None:
+                    texture = textures[img] = video.Texture.from_surface(
+                        renderer, img)
+                texture.draw(srcrect=clip.move(-r.x, -r.y),
+                             dstrect=self.to_view(clip))
+        renderer.present()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Battle HUD: the life bars, serpents, scores and chrono, composed into the
+battle background instead of being sprites, see `Hud`.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from pygame import Rect, Surface
+from pygame.sprite import DirtySprite
+
+import barbariantuw.anims as anims
+from barbariantuw import Game, Theme
+from barbariantuw.core import AnimatedSprite, Counter
+from barbariantuw.sprites import loc, loc2pxX, loc2pxY
+
+
+class Hud(object):
+    """
+    Draws the HUD on the battle `back`ground, one subsurface per side of
+    the top band, the chrono with the side B. A change redraws the
+    elements of its side over the `stage` pixels of the changed area
+    only, `flush` returns the rect to repaint.
+    """
+
+    def __init__(self, back: Surface, stage: Surface,
+                 chrono: Optional[int] = None):
+        self.back = back
+        self.stage = stage
+        sz = Game.chh
+        self.scoreA = Counter(sz, Game.scoreA, 5, Theme.TXT, loc(13, 8))
+        self.scoreB = Counter(sz, Game.scoreB, 5, Theme.TXT, loc(24, 8))
+        self.chrono = None
+        if chrono is not None:
+            self.chrono = Counter(sz, chrono, 2, Theme.TXT, loc(20, 8))
+        self.serpentA = AnimatedSprite((11 * Game.scx, 22 * Game.scy),
+                                       anims.serpent())
+        self.serpentB = AnimatedSprite((275 * Game.scx, 22 * Game.scy),
+                                       anims.serpent_rtl())
+        self.vieA0 = AnimatedSprite((43 * Game.scx, 0), anims.vie())
+        self.vieA1 = AnimatedSprite((43 * Game.scx, 11 * Game.scy),
+                                    anims.vie())
+        self.vieB0 = AnimatedSprite((276 * Game.scx, 0), anims.vie())
+        self.vieB1 = AnimatedSprite((276 * Game.scx, 11 * Game.scy),
+                                    anims.vie())
+        self.animated = [self.serpentA, self.serpentB,
+                         self.vieA0, self.vieA1, self.vieB0, self.vieB1]
+        w, h = back.get_width(), loc2pxY(10)
+        split = loc2pxX(20)
+        b = [self.scoreB] + ([self.chrono] if self.chrono else [])
+        self.sides: List[Tuple[Surface, List[DirtySprite]]] = [
+            (back.subsurface(0, 0, split, h),
+             [self.scoreA, self.serpentA, self.vieA0, self.vieA1]),
+            (back.subsurface(split, 0, w - split, h),
+             b + [self.serpentB, self.vieB0, self.vieB1]),
+        ]
+        self.drawn: Dict[DirtySprite, Rect] = {
+            el: el.rect.copy() for _, elements in self.sides
+            for el in elements}
+        for el in self.drawn:
+            el.dirty = 1
+        self.flush()
+
+    def vie(self, rtl: bool, num: int):
+        if rtl:
+            self.vieB0.set_frame('vie_rtl', max(0, min(6, 6 - num)))
+            self.vieB1.set_frame('vie_rtl', max(0, min(6, 12 - num)))
+            self.serpentB.animate('bite')
+        else:
+            self.vieA0.set_frame('vie', max(0, min(6, 6 - num)))
+            self.vieA1.set_frame('vie', max(0, min(6, 12 - num)))
+            self.serpentA.animate('bite')
+
+    def bite(self):
+        self.serpentA.animate('bite')
+        self.serpentB.animate('bite')
+
+    def update(self, current_time):
+        for spr in self.animated:
+            spr.update(current_time)
+
+    def flush(self) -> Optional[Rect]:
+        """
+        Redraws the changed elements, returns the changed screen area.
+        """
+        dirty: Optional[Rect] = None
+        for side, elements in self.sides:
+            changed = [r for el in elements if el.dirty
+                       for r in (self.drawn[el], el.rect)]
+            if not changed:
+                continue
+            bounds = Rect(side.get_offset(), side.get_size())
+            area = changed[0].unionall(changed[1:]).clip(bounds)
+            self.back.blit(self.stage, area, area)
+            dx = bounds.x
+            side.set_clip(area.move(-dx, 0))
+            for el in elements:
+                if el.visible:
+                    side.blit(el.image, el.rect.move(-dx, 0))
+                self.drawn[el] = el.rect.copy()
+                el.dirty = 0
+            side.set_clip(None)
+            dirty = dirty.union(area) if dirty else area
+        return dirty
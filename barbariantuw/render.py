@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Battle renderer: the fixed layer set of the battle drawn a layer at a
+time with `Surface.fblits`, instead of `LayeredDirty.draw`.
+"""
+from time import perf_counter
+from typing import Dict, List
+
+from pygame import Rect, Surface
+from pygame.sprite import DirtySprite, LayeredDirty
+
+LAYERS = {
+    0: 'decor',  # the sorcerer stage masks, pause and end texts
+    1: 'fighters',
+    2: 'dead',  # see `Battle.on_mort`
+    3: 'effects',  # blood, heads, fire
+    4: 'gnome',
+    5: 'trees',  # `stage_front`
+    99: 'debug',
+}
+
+
+def _merge(rects: List[Rect], r: Rect):
+    i = r.collidelist(rects)
+    while i > -1:
+        r.union_ip(rects[i])
+        del rects[i]
+        i = r.collidelist(rects)
+    rects.append(r)
+
+
+class LayerRenderer(object):
+    """
+    Draws the sprites of a `LayeredDirty` battle over its `background`
+    with its own bookkeeping, the group only lists the sprites and their
+    layers: the `dirty` flags, the rects drawn last and the areas to
+    `repaint`, the ones of the removed sprites too. The dirty areas are
+    merged into disjoint rects, the background restored there in one
+    `blits`, then every layer is drawn with one `fblits` per rect,
+    clipped. The first frame is drawn whole.
+    No switch to full screen drawing on slow frames and no `source_rect`
+    or `blendmode`, the battle sprites use none.
+    `times` sums the seconds per layer (the background included).
+    """
+
+    def __init__(self, background: Surface):
+        self.background = background
+        self.times: Dict[str, float] = dict.fromkeys(
+            ('background', *LAYERS.values()), 0.)
+        self.drawn: Dict[DirtySprite, Rect] = {}
+        self.lost: List[Rect] = []
+        self.full = True
+
+    def repaint(self, r: Rect):
+        self.lost.append(Rect(r))
+
+    def draw(self, group: LayeredDirty, surface: Surface) -> List[Rect]:
+        t0 = perf_counter()
+        orig_clip = surface.get_clip()
+        screen = group.get_clip() or orig_clip
+        drawn = self.drawn
+        sprites = group.sprites()
+        update: List[Rect] = []
+        if self.full:
+            dirty = sprites
+            update.append(Rect(screen))
+        else:
+            dirty = [spr for spr in sprites if spr.dirty > 0]
+            for spr in drawn.keys() - set(sprites):
+                self.lost.append(drawn.pop(spr))
+            for r in self.lost:
+                if r := r.clip(screen):
+                    _merge(update, r)
+            for spr in dirty:
+                if r := spr.rect.clip(screen):
+                    _merge(update, r)
+                if (old := drawn.get(spr)) and (r := old.clip(screen)):
+                    _merge(update, r)
+        if update:
+            self._draw(group, sprites, surface, screen, update, t0)
+        for spr in dirty:
+            if spr.visible:
+                drawn[spr] = Rect(spr.rect.topleft,
+                                  spr.image.get_size()).clip(screen)
+            else:
+                drawn.pop(spr, None)
+            if spr.dirty == 1 and not self.full:
+                spr.dirty = 0
+        surface.set_clip(orig_clip)
+        self.lost.clear()
+        self.full = False
+        return update
+
+    def _draw(self, group: LayeredDirty, sprites: List[DirtySprite],
+              surface: Surface, screen: Rect, update: List[Rect],
+              t0: float):
+        layer_of = group.get_layer_of_sprite
+        runs: Dict[int, list] = {}
+        for spr in sprites:
+            if spr.visible:
+                runs.setdefault(layer_of(spr), []).append(
+                    (spr.image, spr.rect))
+        surface.set_clip(screen)
+        surface.blits([(self.background, r, r) for r in update],
+                      doreturn=False)
+        times = self.times
+        t1 = perf_counter()
+        times['background'] += t1 - t0
+        for layer, batch in runs.items():
+            for r in update:
+                surface.set_clip(r)
+                surface.fblits(batch)
+            t0, t1 = t1, perf_counter()
+            name = LAYERS.get(layer, str(layer))
+            times[name] = times.get(name, 0.) + t1 - t0
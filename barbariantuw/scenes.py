@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 import enum
+from functools import partial
 from itertools import cycle
-from typing import List
+from typing import List, Callable, Optional, Sequence, Tuple
 
 import pygame.key
-from pygame import Surface, mixer
+from pygame import Surface
 from pygame.event import Event
 from pygame.locals import *
 from pygame.sprite import LayeredDirty, Group
@@ -13,9 +14,13 @@ from pygame.time import get_ticks
 import barbariantuw.ai as ai
 import barbariantuw.anims as anims
 from barbariantuw import Game, Partie, Theme, Levier, State
+from barbariantuw.assets import stage_bundles, blit_format
 from barbariantuw.core import (
-    get_img, get_snd, snd_play, Rectangle, Txt, StaticSprite, AnimatedSprite
+    get_img, get_snd, snd_play, Rectangle, Txt, StaticSprite, AnimatedSprite,
+    Preloader, load_frames, img_cache, snd_sizes, snd_stop_all, ImgKey,
 )
+from barbariantuw.hud import Hud
+from barbariantuw.render import LayerRenderer
 from barbariantuw.sprites import Barbarian, loc2pxX, loc2pxY, loc, Sorcier
 
 
@@ -33,6 +38,13 @@ class EmptyScene(LayeredDirty):
     def process_event(self, evt):
         pass
 
+    @property
+    def idle(self) -> bool:
+        """
+        Nothing under the player control, a frame hitch goes unnoticed.
+        """
+        return True
+
 
 def is_any_key_pressed(evt):
     return (evt.type == JOYBUTTONDOWN
@@ -40,14 +52,126 @@ def is_any_key_pressed(evt):
                                                     K_ESCAPE, K_SPACE)))
 
 
+SOUNDS = (
+    'tombe.ogg', 'epee.ogg', 'roule.ogg', 'touche.ogg', 'touche2.ogg',
+    'touche3.ogg', 'attente.ogg', 'tete.ogg', 'tete2.ogg', 'decapite.ogg',
+    'block1.ogg', 'block2.ogg', 'block3.ogg', 'coupdetete.ogg',
+    'coupdepied.ogg', 'feu.ogg', 'mortdecap.ogg', 'mortKO.ogg', 'prepare.ogg',
+    'protege.ogg', 'grogne1.ogg', 'grogne2.ogg',
+)
+
+
+def preload_jobs(opts) -> List[Callable[[], object]]:
+    """
+    Menu, the first solo and the demo battle assets.
+    """
+    jobs = [partial(get_img, name) for name in (
+        'menu/menu.png', 'menu/logoDS.png', 'menu/heroes.png',
+        'stage/logoDS2.png',
+    )]
+    jobs.extend((partial(load_frames, anims.barb, 'spritesA'),
+                 partial(load_frames, anims.tete_decap, 'spritesA')))
+    jobs.extend(stage_jobs('foret', 0))  # solo
+    if not stage_bundles(4):  # web, fetched during the menu
+        jobs.extend(stage_jobs('foret', 4))  # demo
+    jobs.extend(partial(load_frames, factory) for factory in (
+        anims.sang_decap, anims.teteombre_decap, anims.vie,
+        anims.serpent, anims.serpent_rtl, anims.gnome))
+    if opts.sound:
+        jobs.extend(partial(get_snd, name) for name in SOUNDS)
+    return jobs
+
+
+def stage_jobs(decor: str, ia: int) -> List[Callable[[], object]]:
+    """
+    Background and the opponent of the stage, facing left. Turned around
+    frames are loaded on demand.
+    """
+    subdir = f'spritesB/spritesB{ia}'
+    return [partial(get_img, f'stage/{decor}.gif'),
+            partial(stage_front, decor),
+            partial(load_frames, anims.barb_rtl, subdir),
+            partial(load_frames, anims.tete_decap, subdir)]
+
+
+def stage_back(decor: str, labels: Sequence[Tuple[str, Tuple[int, int]]]
+               ) -> Surface:
+    """
+    Battle background with everything static baked in: the decor, the USA
+    logo and the (text, position) `labels`. Composed once per decor,
+    country, labels and scale, in the image cache.
+    """
+    key_ = ImgKey('.'.join([f'stage/{decor}', Game.country,
+                            *(msg for msg, _ in labels)]),
+                  scale=(Game.scx, Game.scy))
+    back = img_cache.get(key_)
+    if back is not None:
+        return back
+    back = get_img(f'stage/{decor}.gif').copy()
+    if Game.country == 'USA':
+        if decor == 'foret':
+            back.blit(get_img('stage/logoDS2.png'),
+                      (59 * Game.scx, 16 * Game.scy))
+        elif decor == 'plaine':
+            back.blit(get_img('stage/logoDS2.png'),
+                      (59 * Game.scx, 14 * Game.scy))
+        elif decor in ('arene', 'trone'):
+            back.blit(get_img('stage/logoDS3.png'),
+                      (59 * Game.scx, 16 * Game.scy))
+    for msg, pos in labels:
+        back.blit(Txt(Game.chh, msg, Theme.TXT, pos).image, pos)
+    return img_cache.put(key_, back)
+
+
+def stage_front(decor: str) -> Surface:
+    """
+    Battle foreground: both trees in one colorkey image, drawn over the
+    fighters at (0, 104).
+    """
+    sc = (Game.scx, Game.scy)  # a prefetch job, see `get_img`
+    key_ = ImgKey(f'stage/{decor}.front', scale=sc)
+    front = img_cache.get(key_)
+    if front is not None:
+        return front
+    left = get_img(f'stage/{decor}ARBREG.gif', scale=sc)
+    right = get_img(f'stage/{decor}ARBRED.gif', scale=sc)
+    front = Surface((round(320 * sc[0]),
+                     max(left.get_height(), right.get_height())), SRCALPHA)
+    front.blit(left, (0, 0))
+    front.blit(right, (272 * sc[0], 0))
+    return img_cache.put(key_, blit_format(front))
+
+
 class Logo(EmptyScene):
     def __init__(self, opts, *, on_load):
         super(Logo, self).__init__(opts)
         self.usaLogo = False
         self.titre = False
-        self.load = False
         self.skip = False
         self.on_load = on_load
+        self.preloader = Preloader(preload_jobs(opts))
+        if self.opts.debug:
+            self.progress = Txt.Debug(0, Game.screen[1] - Game.chh)
+            # noinspection PyTypeChecker
+            self.add(self.progress, layer=99)
+
+    def do_load(self):
+        if self.preloader.finished:
+            if self.opts.debug:
+                print(f'preloaded: {len(img_cache)} images,'
+                      f' {img_cache.size / 1024:.0f} Kb,'
+                      f' {img_cache.dups} duplicates'
+                      f' ({img_cache.deduped / 1024:.0f} Kb) interned')
+                sizes = snd_sizes()
+                print(f'preloaded: {len(sizes)} sounds,'
+                      f' {sum(sizes.values()) / 1024:.0f} Kb resident,'
+                      f' {list(sizes.values()).count(0)} streamed')
+                if self.opts.debug > 1:
+                    for name, size in sorted(sizes.items(),
+                                             key=lambda i: -i[1]):
+                        print(f'  {name:16}', f'{size / 1024:6.0f} Kb'
+                              if size else 'streamed')
+            self.on_load()
 
     def show_usa_logo(self):
         if self.usaLogo:
@@ -83,36 +207,12 @@ class Logo(EmptyScene):
         self.clear(None, img)
         self.repaint_rect(((0, 0), Game.screen))
 
-    def do_load(self):
-        if self.load:
-            return
-        self.load = True
-        if self.opts.sound:
-            get_snd('tombe.ogg')
-            get_snd('epee.ogg')
-            get_snd('roule.ogg')
-            get_snd('touche.ogg')
-            get_snd('touche2.ogg')
-            get_snd('touche3.ogg')
-            get_snd('attente.ogg')
-            get_snd('tete.ogg')
-            get_snd('tete2.ogg')
-            get_snd('decapite.ogg')
-            get_snd('block1.ogg')
-            get_snd('block2.ogg')
-            get_snd('block3.ogg')
-            get_snd('coupdetete.ogg')
-            get_snd('coupdepied.ogg')
-            get_snd('feu.ogg')
-            get_snd('mortdecap.ogg')
-            get_snd('mortKO.ogg')
-            get_snd('prepare.ogg')
-            get_snd('protege.ogg')
-            get_snd('grogne1.ogg')
-            get_snd('grogne2.ogg')
-
     def update(self, current_time, *args):
         super(Logo, self).update(current_time, *args)
+        self.preloader.poll()
+        if self.opts.debug:
+            self.progress.msg = (f'Load: {self.preloader.done}'
+                                 f' / {self.preloader.total}')
         passed = current_time - self.timer
         if Game.country == 'USA':
             if passed < 4000:
@@ -122,19 +222,17 @@ class Logo(EmptyScene):
                     self.timer = current_time - 4000
             elif 4000 <= passed < 8000:
                 self.show_titre()
-                self.do_load()
                 if self.skip:
                     self.timer = current_time - 8000
             else:
-                self.on_load()
+                self.do_load()
         else:
             if passed < 4000:
                 self.show_titre()
-                self.do_load()
                 if self.skip:
                     self.timer = current_time - 4000
             else:
-                self.on_load()
+                self.do_load()
 
     def process_event(self, evt):
         if is_any_key_pressed(evt):
@@ -295,6 +393,7 @@ class Battle(EmptyScene):
     sorcier: bool = False
     entreesorcier: bool = False
     lancerintro: bool = True
+    decided: bool = False  # a barbarian dead or the time out
     bState: BattleState = BattleState.in_progress
 
     def __init__(self, opts, *, on_esc, on_next, on_finish):
@@ -302,20 +401,17 @@ class Battle(EmptyScene):
         self.on_esc = on_esc
         self.on_finish = on_finish
         self.on_next = on_next
-        back = get_img(f'stage/{Game.decor}.gif')
-        if Game.country == 'USA':
-            back = back.copy()
-            if Game.decor in ('foret', 'plaine'):
-                logo = get_img('stage/logoDS2.png')
-                if Game.decor == 'foret':
-                    back.blit(logo, (59 * Game.scx, 16 * Game.scy))
-                elif Game.decor == 'plaine':
-                    back.blit(logo, (59 * Game.scx, 14 * Game.scy))
-            if Game.decor in ('arene', 'trone'):
-                logo = get_img('stage/logoDS3.png')
-                back.blit(logo, (59 * Game.scx, 16 * Game.scy))
-        # noinspection PyTypeChecker
-        self.clear(None, back)
+        labels = []
+        if Game.partie == Partie.solo:
+            labels.append(('ONE  PLAYER', loc(16, 25)))
+        elif Game.partie == Partie.vs:
+            labels.append(('TWO PLAYERS', loc(16, 25)))
+        elif Game.partie == Partie.demo:
+            labels.append(('DEMO', loc(18, 25)))
+        if Game.partie != Partie.vs:
+            labels.append((f'{Game.ia:02}', loc(20, 8)))
+        stage = stage_back(Game.decor, labels)
+        back = stage.copy()  # the HUD draws on it
         self.debugAttArea = False
         if self.opts.debug > 1:
             self.jAstate = Txt.Debug(loc2pxX(10), 0)
@@ -350,54 +446,27 @@ class Battle(EmptyScene):
                 self.jAAtt, self.jAF, self.jAT, self.jAM, self.jAG,
                 self.jBAtt, self.jBF, self.jBT, self.jBM, self.jBG)
         # noinspection PyTypeChecker
-        self.add(
-            StaticSprite((0, 104 * Game.scy),
-                         f'stage/{Game.decor}ARBREG.gif'),
-            StaticSprite((272 * Game.scx, 104 * Game.scy),
-                         f'stage/{Game.decor}ARBRED.gif'),
-            layer=5)
+        self.add(StaticSprite((0, 104 * Game.scy), stage_front(Game.decor)),
+                 layer=5)
 
         self.joueurA = Barbarian(opts, loc2pxX(1), loc2pxY(14),
                                  'spritesA', rtl=False)
         self.joueurA.infoCoup = 1
         self.joueurB = Barbarian(opts, loc2pxX(36), loc2pxY(14),
                                  f'spritesB/spritesB{Game.ia}', rtl=True)
-        sz = Game.chh
-        if Game.partie == Partie.solo:
-            Txt(sz, 'ONE  PLAYER', Theme.TXT, loc(16, 25), self)
-        elif Game.partie == Partie.vs:
-            Txt(sz, 'TWO PLAYERS', Theme.TXT, loc(16, 25), self)
-        elif Game.partie == Partie.demo:
-            Txt(sz, 'DEMO', Theme.TXT, loc(18, 25), self)
-
-        self.txtScoreA = Txt(sz, f'{Game.scoreA:05}', Theme.TXT, loc(13, 8),
-                             self, cached=False)
-        self.txtScoreB = Txt(sz, f'{Game.scoreB:05}', Theme.TXT, loc(24, 8),
-                             self, cached=False)
-
-        if Game.partie == Partie.vs:
-            self.txtChronometre = Txt(sz, f'{self.chronometre:02}',
-                                      Theme.TXT, loc(20, 8), self)
-        else:
-            Txt(sz, f'{Game.ia:02}', Theme.TXT, loc(20, 8), self)
+        self.hud = Hud(back, stage, self.chronometre
+                       if Game.partie == Partie.vs else None)
+        self.renderer = LayerRenderer(back)
         # noinspection PyTypeChecker
         self.add(self.joueurA, self.joueurB, layer=1)
         self.joueurA.animate('avance')
         self.joueurB.animate('avance')
-        self.serpentA = AnimatedSprite((11 * Game.scx, 22 * Game.scy),
-                                       anims.serpent(), self)
-        self.serpentB = AnimatedSprite((275 * Game.scx, 22 * Game.scy),
-                                       anims.serpent_rtl(), self)
         self.temps = 0
         self.tempsfini = False
         self.inverse = False
         self.soncling = cycle(['block1.ogg', 'block2.ogg', 'block3.ogg'])
         self.songrogne = cycle([0, 0, 0, 'grogne1.ogg', 0, 0, 'grogne1.ogg'])
         self.sontouche = cycle(['touche.ogg', 'touche2.ogg', 'touche3.ogg'])
-        self.vieA0 = AnimatedSprite((43 * Game.scx, 0), anims.vie(), self)
-        self.vieA1 = AnimatedSprite((43 * Game.scx, 11 * Game.scy), anims.vie(), self)
-        self.vieB0 = AnimatedSprite((276 * Game.scx, 0), anims.vie(), self)
-        self.vieB1 = AnimatedSprite((276 * Game.scx, 11 * Game.scy), anims.vie(), self)
         self.joueurA.on_vie_changed = self.on_vieA_changed
         self.joueurA.on_score = self.on_scoreA
         self.joueurA.on_mort = self.on_mort
@@ -411,12 +480,12 @@ class Battle(EmptyScene):
 
     def finish(self):
         if self.opts.sound:
-            mixer.stop()
+            snd_stop_all()
         self.on_finish()
 
     def next_stage(self):
         if self.opts.sound:
-            mixer.stop()
+            snd_stop_all()
         self.on_next()
 
     def process_event(self, evt):
@@ -431,7 +500,7 @@ class Battle(EmptyScene):
         if evt.type == KEYUP and evt.key == K_ESCAPE:
             if self.bState in (BattleState.in_progress, BattleState.pause):
                 if self.opts.sound:
-                    mixer.stop()
+                    snd_stop_all()
                 self.on_esc()
             else:
                 self.finish()
@@ -632,7 +701,7 @@ class Battle(EmptyScene):
         self.joueurA.x = loc2pxX(17)
         # noinspection PyTypeChecker
         self.add(
-            StaticSprite((self.joueurA.rect.right, loc2pxY(17)),
+            StaticSprite((self.joueurA.box.right, loc2pxY(17)),
                          'sprites/marianna.gif'),
             StaticSprite((186 * Game.scx, 95 * Game.scy), 'fill',
                          w=15, h=20, fill=Theme.BLACK),
@@ -721,25 +790,22 @@ class Battle(EmptyScene):
                 (5, 29))
 
     def on_vieA_changed(self, num):
-        self.vieA0.set_frame('vie', max(0, min(6, 6 - num)))
-        self.vieA1.set_frame('vie', max(0, min(6, 12 - num)))
-        self.serpentA.animate('bite')
+        self.hud.vie(False, num)
 
     def on_vieB_changed(self, num):
-        self.vieB0.set_frame('vie_rtl', max(0, min(6, 6 - num)))
-        self.vieB1.set_frame('vie_rtl', max(0, min(6, 12 - num)))
-        self.serpentB.animate('bite')
+        self.hud.vie(True, num)
 
     def on_scoreA(self, increment):
         Game.scoreA += increment
-        self.txtScoreA.msg = f'{Game.scoreA:05}'
+        self.hud.scoreA.value = Game.scoreA
 
     def on_scoreB(self, increment):
         Game.scoreB += increment
-        self.txtScoreB.msg = f'{Game.scoreB:05}'
+        self.hud.scoreB.value = Game.scoreB
 
     def on_mort(self, mort: Barbarian):
         self.chronoOn = False
+        self.decided = True
         # noinspection PyTypeChecker
         self.change_layer(mort, 2)
 
@@ -753,19 +819,19 @@ class Battle(EmptyScene):
         gnome = self.gnomeSprite
 
         if mort.state == State.mort:
-            if (gnome.rect.left >= mort.rect.right - Game.chw
+            if (gnome.box.left >= mort.box.right - Game.chw
                     and mort.anim != 'mortgnome'):
-                mort.topleft = mort.rect.topleft
+                mort.topleft = mort.box.topleft
                 mort.animate('mortgnome')
         elif mort.state == State.mortdecap:
-            if (gnome.rect.left >= mort.rect.right - Game.chw
+            if (gnome.box.left >= mort.box.right - Game.chw
                     and mort.anim != 'mortdecapgnome'):
-                mort.topleft = mort.rect.topleft
+                mort.topleft = mort.box.topleft
                 mort.animate('mortdecapgnome')
             if mort.tete.alive():
-                if gnome.rect.right >= mort.tete.rect.center[0]:
+                if gnome.box.right >= mort.tete.box.center[0]:
                     mort.animate_football()
-                if mort.tete.rect.left > Game.screen[0]:
+                if mort.tete.box.left > Game.screen[0]:
                     mort.stop_football()
         if gnome.alive() and mort.xLoc > MORT_RIGHT_BORDER:
             gnome.kill()
@@ -790,15 +856,16 @@ class Battle(EmptyScene):
                     ja.sortie = jb.sortie = True
                     ja.occupe = jb.occupe = False
                     self.tempsfini = True
+                    self.decided = True
                     ja.animate('recule')
                     jb.animate('recule')
-            self.txtChronometre.msg = f'{self.chronometre:02}'
+            self.hud.chrono.value = self.chronometre
 
     def joueurX_bonus(self, winner: Barbarian, dead: Barbarian):
         if self.chronometre > 0:
             winner.on_score(10)
             self.chronometre -= 1
-            self.txtChronometre.msg = f'{self.chronometre:02}'
+            self.hud.chrono.value = self.chronometre
         elif dead.xLoc >= MORT_RIGHT_BORDER:
             winner.bonus = False
             winner.sortie = True
@@ -806,9 +873,8 @@ class Battle(EmptyScene):
             winner.animate('recule')
 
     def do_entree(self, jax, jbx):
-        if self.serpentA.anim == 'idle' and jax >= 3:
-            self.serpentA.animate('bite')
-            self.serpentB.animate('bite')
+        if self.hud.serpentA.anim == 'idle' and jax >= 3:
+            self.hud.bite()
         if jax >= 13:
             self.joueurA.x = loc2pxX(13)
         if jbx <= 22:
@@ -837,7 +903,15 @@ class Battle(EmptyScene):
             if jax >= MORT_RIGHT_BORDER and (jbx <= 0 or 38 <= jbx):
                 self.finish()
 
+    @property
+    def idle(self) -> bool:
+        return self.decided or self.bState != BattleState.in_progress
+
     def update(self, current_time, *args):
+        with img_cache.pinning():  # the frames shown, see `Frame.image`
+            self.update_battle(current_time, *args)
+
+    def update_battle(self, current_time, *args):
         ja = self.joueurA
         jb = self.joueurB
         ja.xLocPrev = ja.xLoc  # for collision
@@ -848,6 +922,7 @@ class Battle(EmptyScene):
                 self.chrono = current_time + ms
             return
         super(Battle, self).update(current_time, *args)
+        self.hud.update(current_time)
         if self.bState != BattleState.in_progress:
             return
         if self.chronoOn:
@@ -859,6 +934,24 @@ class Battle(EmptyScene):
         if self.opts.debug > 1:
             self.debug(ja, jb)
 
+    def repaint_rect(self, screen_rect):
+        self.renderer.repaint(screen_rect)
+
+    def draw(self, surface, *args):
+        if area := self.hud.flush():
+            self.repaint_rect(area)
+        return self.renderer.draw(self, surface)
+
+    def composite(self) -> Tuple[Surface, Optional[Rect],
+                                 List[Tuple[Surface, Rect]]]:
+        """
+        The battle for a display compositing textures instead of `draw`:
+        the background, its area changed since the last call and the
+        visible sprites in drawing order, see `RendererDisplay`.
+        """
+        return self.hud.back, self.hud.flush(), [
+            (spr.image, spr.rect) for spr in self.sprites() if spr.visible]
+
     def update_internal(self, ja, jb):
         if ja.bonus:
             self.joueurX_bonus(ja, jb)
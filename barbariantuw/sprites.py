@@ -1070,9 +1070,9 @@ class Barbarian(AnimatedSprite):
 
     def animate_football(self):
         if self.tete.stopped:
-            self.tete.topleft = self.tete.rect.topleft
+            self.tete.topleft = self.tete.box.topleft
             self.tete.animate('football')
-            self.teteOmbre.topleft = self.teteOmbre.rect.topleft
+            self.teteOmbre.topleft = self.teteOmbre.box.topleft
             self.teteOmbre.animate('football')
 
     def stop_football(self):
@@ -9,9 +9,10 @@ import pygame as pg
 from pygame.locals import *
 
 import barbariantuw.anims as anims
+import barbariantuw.assets as assets
 from barbariantuw import Game, Theme, OPTS
 from barbariantuw.__main__ import BarbarianMain, arg_parser
-from barbariantuw.core import Rectangle, Txt, img_cache
+from barbariantuw.core import Rectangle, Txt, img_cache, anim_tables
 from barbariantuw.scenes import EmptyScene
 from barbariantuw.sprites import Barbarian
 
@@ -106,9 +107,9 @@ class AnimationViewerScene(EmptyScene):
             if evt.key == K_SPACE:
                 self.target.kill()
 
-                for v in img_cache.values():
-                    del v
                 img_cache.clear()
+                assets.unload()
+                anim_tables.clear()
                 importlib.reload(anims)
 
                 speed = self.target.speed
@@ -192,21 +193,21 @@ class AnimationViewerScene(EmptyScene):
 
     # noinspection PyShadowingNames
     def update(self, *args: Any, **kwargs: Any) -> None:
-        prev = self.target.rect.left
+        prev = self.target.box.left
         super().update(*args, **kwargs)
-        if not self.canMove and self.target.frame.mv and prev != self.target.rect.left:
+        if not self.canMove and self.target.frame.mv and prev != self.target.box.left:
             self.target.move(-self.target.frame.mv[0], 0)
-        elif self.target.rect.left < 0:
-            self.target.move(-self.target.rect.left, 0)
-        elif self.target.rect.right > Game.screen[0]:
-            self.target.move(Game.screen[0] - self.target.rect.right, 0)
+        elif self.target.box.left < 0:
+            self.target.move(-self.target.box.left, 0)
+        elif self.target.box.right > Game.screen[0]:
+            self.target.move(Game.screen[0] - self.target.box.right, 0)
 
         self.frameTxt.msg = (
             f'{self.target.frameNum + 1} / {len(self.target.frames)}'
             f' ({self.target.frame.name})'
         )
         if self.border:
-            self.borderGroup.apply(self.target.rect)
+            self.borderGroup.apply(self.target.box)
 
 
 if __name__ == '__main__':
@@ -218,5 +219,5 @@ if __name__ == '__main__':
         OPTS.__setattr__(k, v)
     main = BarbarianMain(args)
     main.scene = AnimationViewerScene(args, main)
-    pg.display.set_caption('Barbarian - Animation viewer')
+    main.display.set_caption('Barbarian - Animation viewer')
     asyncio.run(main.main())
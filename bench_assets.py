@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Decode benchmark of the image formats the pak could store, see
+`pak_image`: stored size, decode time with and without the conversion
+to the display format and the resident size of the decoded surface.
+QOI is encoded here, SDL_image only loads it.
+Then the cold start of a full stage (background plus two fighters)
+from the loose GIFs and from the pak, and the blit time of a full battle
+frame with the `blit_format` surfaces and with per-pixel alpha ones.
+"""
+import argparse
+import io
+import struct
+import time
+from os.path import join
+from pathlib import Path
+
+from pygame import Surface, image
+
+from barbariantuw import IMG_PATH, OPTS
+from barbariantuw.assets import init_display, palettized, pak, open_img
+
+
+def qoi(img: Surface) -> bytes:
+    """
+    https://qoiformat.org/qoi-specification.pdf
+    """
+    w, h = img.get_size()
+    rgba = image.tobytes(img, 'RGBA')
+    out = bytearray(b'qoif' + struct.pack('>IIBB', w, h, 4, 0))
+    index = [b''] * 64
+    prev, run = b'\0\0\0\xff', 0
+    for i in range(0, len(rgba), 4):
+        px = rgba[i:i + 4]
+        if px == prev:
+            run += 1
+            if run == 62:
+                out.append(0xc0 | run - 1)
+                run = 0
+            continue
+        if run:
+            out.append(0xc0 | run - 1)
+            run = 0
+        r, g, b, a = px
+        pos = (r * 3 + g * 5 + b * 7 + a * 11) % 64
+        if index[pos] == px:
+            out.append(pos)
+        elif a != prev[3]:
+            out += bytes((0xff, r, g, b, a))
+        else:
+            dr, dg, db = ((c - p + 128) % 256 - 128
+                          for c, p in zip(px[:3], prev))
+            drg, dbg = dr - dg, db - dg
+            if -2 <= dr <= 1 and -2 <= dg <= 1 and -2 <= db <= 1:
+                out.append(0x40 | (dr + 2) << 4 | (dg + 2) << 2 | db + 2)
+            elif -32 <= dg <= 31 and -8 <= drg <= 7 and -8 <= dbg <= 7:
+                out += bytes((0x80 | dg + 32, (drg + 8) << 4 | dbg + 8))
+            else:
+                out += bytes((0xfe, r, g, b))
+        index[pos] = px
+        prev = px
+    if run:
+        out.append(0xc0 | run - 1)
+    return bytes(out + b'\0' * 7 + b'\1')
+
+
+def encode(path: Path):
+    """
+    {format: (stored bytes, decoder)} of the image file.
+    """
+    src = path.read_bytes()
+    img = image.load(path)
+    w, h = img.get_size()
+    formats = {path.suffix[1:].upper() + ' file':
+               (src, lambda b: image.load(io.BytesIO(b), path.name))}
+    indexed = img if img.get_bitsize() == 8 else palettized(img)
+    if indexed:
+        pal, key = indexed.get_palette(), indexed.get_colorkey()
+
+        def raw_p(b):
+            surf = image.frombuffer(bytearray(b), (w, h), 'P')
+            surf.set_palette(pal)
+            if key:
+                surf.set_colorkey(key)
+            return surf
+        formats['P'] = image.tobytes(indexed, 'P'), raw_p
+    rgba = img.convert_alpha()
+    formats['RGBA'] = image.tobytes(rgba, 'RGBA'), lambda b: image.frombuffer(
+        bytearray(b), (w, h), 'RGBA')
+    png = io.BytesIO()
+    image.save(indexed or img, png, 'x.png')
+    formats['PNG'] = png.getvalue(), lambda b: image.load(
+        io.BytesIO(b), 'x.png')
+    formats['QOI'] = qoi(rgba), lambda b: image.load(io.BytesIO(b), 'x.qoi')
+    return formats
+
+
+def best(fn, repeat: int) -> float:
+    t = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        t.append(time.perf_counter() - t0)
+    return min(t)
+
+
+def bench_formats(files, repeat: int):
+    total = {}
+    for path in files:
+        for fmt, (data, decode) in encode(path).items():
+            img = decode(data)
+            t = total.setdefault(fmt, [0, 0, 0, 0, 0])
+            t[0] += 1
+            t[1] += len(data)
+            t[2] += best(lambda: decode(data), repeat)
+            t[3] += best(lambda: decode(data).convert_alpha(), repeat)
+            t[4] += img.get_pitch() * img.get_height()
+    print(f'{len(files)} images, best of {repeat}')
+    print(f'{"format":8}{"count":>6}{"stored Kb":>11}{"decode ms":>11}'
+          f'{"+convert ms":>13}{"resident Kb":>13}')
+    for fmt, (n, size, dec, conv, res) in total.items():
+        print(f'{fmt:8}{n:6}{size // 1024:11}{dec * 1000:11.2f}'
+              f'{conv * 1000:13.2f}{res // 1024:13}')
+
+
+def bench_stage(decor: str, ia: int):
+    files = [join(IMG_PATH, f'stage/{decor}.gif')]
+    for subdir in ('spritesA', f'spritesB/spritesB{ia}'):
+        files += sorted(str(f) for f in Path(IMG_PATH, subdir).glob('*.gif'))
+    t0 = time.perf_counter()
+    for f in files:
+        image.load(f).convert_alpha()
+    t1 = time.perf_counter()
+    for f in files:
+        open_img(f).convert_alpha()
+    t2 = time.perf_counter()
+    print(f'stage {decor}, spritesA and spritesB{ia}: {len(files)} images,'
+          f' loose {(t1 - t0) * 1000:.2f} ms', end='')
+    if pak:
+        print(f', pak {(t2 - t1) * 1000:.2f} ms, x{(t1 - t0) / (t2 - t1):.1f}')
+    else:
+        print(', no pak, run build_assets.py')
+
+
+def bench_blit(frames: int, repeat: int):
+    from barbariantuw.__main__ import BarbarianMain, arg_parser
+    args = arg_parser().parse_args(['--no-sound', '--no-disk-cache'])
+    args.web = False
+    for k, v in args.__dict__.items():
+        setattr(OPTS, k, v)
+    game = BarbarianMain(args)
+    game.start_battle_demo()
+    battle, screen = game.scene, game.screen
+    for i in range(2500):  # the fighters in the middle
+        battle.update(i * 16)
+        battle.draw(screen)
+
+    def repaint():
+        for _ in range(frames):
+            battle.repaint_rect(screen.get_rect())
+            battle.draw(screen)
+
+    def sprites():
+        for _ in range(frames):
+            for spr in battle.sprites():
+                screen.blit(spr.image, spr.rect)
+    times = [best(repaint, repeat), best(sprites, repeat)]
+    for spr in battle.sprites():
+        spr.image = spr.image.convert_alpha()
+    renderer = battle.renderer
+    renderer.background = renderer.background.convert_alpha()
+    times += [best(repaint, repeat), best(sprites, repeat)]
+    fast, fast_spr, alpha, alpha_spr = (t / frames * 1000 for t in times)
+    print(f'battle frame, {len(battle.sprites())} sprites, ms: colorkey/RLE'
+          f' {fast:.3f} (sprites {fast_spr:.3f}), alpha {alpha:.3f}'
+          f' (sprites {alpha_spr:.3f}), x{alpha / fast:.2f}'
+          f' (sprites x{alpha_spr / fast_spr:.2f})')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--decor', default='foret')
+    parser.add_argument('--ia', type=int, default=0)
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('dirs', nargs='*', default=[IMG_PATH])
+    args = parser.parse_args()
+    init_display()
+    bench_stage(args.decor, args.ia)  # first, cold
+    files = sorted(f for d in args.dirs for f in Path(d).rglob('*')
+                   if f.suffix in ('.gif', '.png') and f.name != 'atlas.png')
+    bench_formats(files, args.repeat)
+    bench_blit(args.frames, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
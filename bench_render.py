@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+CPU time per frame of the battle demo with each display backend, see
+`--renderer`: the scene update, then its render, the draw on the back
+buffer or window and the present scaled to the window, or the textures
+composited on the GPU, with and without `--native`.
+Then the draw time per battle layer, see `LayerRenderer`.
+"""
+import argparse
+import time
+from collections import Counter
+
+from barbariantuw import OPTS, Game
+from barbariantuw.display import RENDERERS
+
+
+def bench(renderer: str, native: int, frames: int, warmup: int):
+    from barbariantuw.__main__ import BarbarianMain, arg_parser
+    argv = ['--no-sound', '--no-disk-cache', '--renderer', renderer]
+    if native:
+        argv += ['--native', str(native)]
+    args = arg_parser().parse_args(argv)
+    args.web = False
+    for k, v in args.__dict__.items():
+        setattr(OPTS, k, v)
+    BarbarianMain.reinit()
+    game = BarbarianMain(args)
+    game.start_battle_demo()
+    battle, display = game.scene, game.display
+    times = {'update': 0., 'render': 0.}
+    wall = 0.
+    layers = Counter()
+    for i in range(warmup + frames):
+        if i == warmup:
+            times = dict.fromkeys(times, 0.)
+            wall = 0.
+            battle.renderer.times = dict.fromkeys(battle.renderer.times, 0.)
+        if game.scene is not battle:  # the demo ended, untimed restart
+            layers.update(battle.renderer.times)
+            game.start_battle_demo()
+            battle = game.scene
+        t0 = time.perf_counter()
+        c0 = time.process_time()
+        battle.update(100000 + i * 16)
+        c1 = time.process_time()
+        display.render(battle)
+        c2 = time.process_time()
+        wall += time.perf_counter() - t0
+        times['update'] += c1 - c0
+        times['render'] += c2 - c1
+    name = type(display).__name__
+    if hasattr(display, 'accelerated'):
+        name += ' (gpu)' if display.accelerated else ' (software)'
+        if display.composited:
+            name += ', composited'
+    cpu = sum(times.values())
+    print(f'{renderer:9}{native or "-":>7}{cpu / frames * 1000:9.3f}'
+          + ''.join(f'{t / frames * 1000:9.3f}' for t in times.values())
+          + f'{wall / frames * 1000:9.3f}  {name}')
+    layers.update(battle.renderer.times)
+    return layers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--frames', type=int, default=1000)
+    parser.add_argument('--warmup', type=int, default=500)
+    parser.add_argument('--native', type=int, nargs='*', default=[0, 1])
+    parser.add_argument('renderers', nargs='*', metavar='renderer',
+                        help=f'{", ".join(RENDERERS)}, default: all')
+    args = parser.parse_args()
+    print(f'battle demo, {args.frames} frames, ms per frame'
+          f' at {Game.screen[0]}x{Game.screen[1]}')
+    print(f'{"renderer":9}{"native":>7}{"cpu":>9}{"update":>9}{"render":>9}'
+          f'{"wall":>9}  display')
+    layers = {}
+    for renderer in args.renderers or RENDERERS:
+        for native in args.native:
+            layers[renderer, native] = bench(renderer, native, args.frames,
+                                             args.warmup)
+    names = list(next(iter(layers.values())))
+    print('\nbattle draw per layer, ms per frame')
+    print(f'{"renderer":9}{"native":>7}' + ''.join(f'{n:>11}' for n in names))
+    for (renderer, native), times in layers.items():
+        print(f'{renderer:9}{native or "-":>7}' + ''.join(
+            f'{times[n] / args.frames * 1000:11.4f}' for n in names))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+from barbariantuw.assets import build
+
+
+def main():
+    build()  # see python -m barbariantuw.assets --help
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,14 @@ import sys
 
 from nuitka.utils.Utils import getArchitecture
 
+import build_assets
 from barbariantuw import __version__, PROG
 
 arch = getArchitecture()
 
 
 def main(*args):
+    build_assets.main()
     nuitka_args = [
         f'--product-name={PROG}',
         f'--product-version={__version__}',
@@ -19,8 +21,9 @@ def main(*args):
         '--nofollow-import-to=*.tests',
         '--noinclude-default-mode=nofollow',
         '--include-data-dir=barbariantuw/fnt=barbariantuw/fnt',
-        '--include-data-dir=barbariantuw/img=barbariantuw/img',
-        '--include-data-dir=barbariantuw/snd=barbariantuw/snd',
+        '--include-data-files=barbariantuw/assets.pak=barbariantuw/assets.pak',
+        '--include-data-files='
+        'barbariantuw/manifest.json=barbariantuw/manifest.json',
     ]
     cmd = 'nuitka'
     if sys.platform == "linux":
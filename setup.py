@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Packages the opponents 1-7 images in the pak only when the built pak
+lists them, see `python -m barbariantuw.assets`, otherwise as loose files.
+The metadata is in pyproject.toml.
+"""
+import json
+import os
+import re
+import struct
+from fnmatch import fnmatch
+from os.path import join
+
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+PAK_ONLY = 'img/spritesB/spritesB[1-7]/*'  # mostly palettes of spritesB0
+
+
+def pak_keys(src_dir: str) -> set:
+    """
+    Asset keys of the pak of the current version, empty if not built.
+    """
+    with open(join(src_dir, 'assets.py'), encoding='utf-8') as f:
+        version = int(re.search(r'^PAK_VERSION = (\d+)', f.read(), re.M)[1])
+    try:
+        with open(join(src_dir, 'assets.pak'), 'rb') as f:
+            magic, ver, size = struct.unpack('<4sHI', f.read(10))  # Pak
+            if magic != b'BTPK' or ver != version:
+                return set()
+            return set(json.loads(f.read(size))['files'])
+    except (OSError, struct.error, ValueError):
+        return set()
+
+
+class BuildPy(build_py):
+    def exclude_data_files(self, package, src_dir, files):
+        files = super().exclude_data_files(package, src_dir, files)
+        if package != 'barbariantuw' or not (keys := pak_keys(src_dir)):
+            return files
+        out = []
+        for f in files:
+            key = os.path.relpath(f, src_dir).replace(os.sep, '/')
+            if not (fnmatch(key, PAK_ONLY) and key in keys):
+                out.append(f)
+        return out
+
+
+setup(cmdclass={'build_py': BuildPy})